@@ -0,0 +1,62 @@
+# Benchmark binding many bundles to a DUT with many pins.
+#
+# The DUT has `units` units of 1000 pins each. Every unit is bound by a bundle with two sub-bundles of 20 signals.
+#
+# Usage:
+#     python benchmarks/bench_bind.py [units] [bind cache dir]
+import sys
+import time
+
+import toffee
+from toffee import Bundle
+
+
+class FakeXData: ...
+
+
+class FakePin:
+    def __init__(self):
+        self.xdata, self.event, self.value, self.mIOType = FakeXData(), None, 0, 0
+
+
+PINS_PER_UNIT = 1000
+SIGNALS = 20
+
+SubBundle = Bundle.new_class_from_list([f"s{i}" for i in range(SIGNALS)])
+
+
+class UnitBundle(Bundle):
+    def __init__(self):
+        super().__init__()
+        self.req = SubBundle.from_prefix("req_")
+        self.resp = SubBundle.from_prefix("resp_")
+
+
+class FakeDUT:
+    def __init__(self, units):
+        for unit in range(units):
+            for i in range(PINS_PER_UNIT // 2):
+                setattr(self, f"unit{unit}_req_s{i}", FakePin())
+                setattr(self, f"unit{unit}_resp_s{i}", FakePin())
+
+    def StepRis(self, func): ...
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    toffee.setup_logging(toffee.WARNING)
+    if len(sys.argv) > 2:
+        toffee.set_bind_cache_dir(sys.argv[2])
+
+    dut = FakeDUT(units)
+
+    start = time.perf_counter()
+    for unit in range(units):
+        UnitBundle.from_prefix(f"unit{unit}_").bind(dut)
+    elapsed = time.perf_counter() - start
+
+    print(f"bound {units} bundles to {units * PINS_PER_UNIT} pins in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
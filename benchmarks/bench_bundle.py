@@ -0,0 +1,129 @@
+# Benchmark the hot paths of Bundle on a nested bundle with 500 signals.
+#
+# The bundle has 10 sub-bundles of 50 signals each, bound to a fake DUT with one pin per signal.
+#
+# Usage:
+#     python benchmarks/bench_bundle.py [iterations]
+import random
+import sys
+import time
+
+import toffee
+from toffee import Bundle
+
+
+class FakeXData: ...
+
+
+class FakePin:
+    def __init__(self):
+        self.xdata, self.event, self.value, self.mIOType = FakeXData(), None, 0, 0
+
+    def IsOutIO(self):
+        return False
+
+    def W(self):
+        return 8
+
+
+SUB_BUNDLES = 10
+SIGNALS = 50
+
+SubBundle = Bundle.new_class_from_list([f"s{i}" for i in range(SIGNALS)])
+
+
+class TopBundle(Bundle):
+    def __init__(self):
+        super().__init__()
+        for i in range(SUB_BUNDLES):
+            setattr(self, f"sub{i}", SubBundle.from_prefix(f"sub{i}_"))
+
+
+class FakeDUT:
+    def __init__(self):
+        for i in range(SUB_BUNDLES):
+            for j in range(SIGNALS):
+                setattr(self, f"io_sub{i}_s{j}", FakePin())
+
+    def StepRis(self, func): ...
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Size of an object and everything it owns, counting shared objects once.
+    """
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__)
+    return size
+
+
+def timeit(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    toffee.setup_logging(toffee.WARNING)
+
+    dut = FakeDUT()
+    bundle = TopBundle.from_prefix("io_").bind(dut)
+
+    multilevel_values = bundle.as_dict()
+    flat_values = bundle.as_dict(multilevel=False)
+
+    reader = bundle.compile_reader()
+    writer = bundle.compile_writer()
+    values = reader()
+    prev_snapshot = bundle.snapshot()
+
+    cases = {
+        "bind": lambda: TopBundle.from_prefix("io_").bind(dut),
+        "as_dict()": lambda: bundle.as_dict(),
+        "as_dict(multilevel=False)": lambda: bundle.as_dict(multilevel=False),
+        "assign(multilevel)": lambda: bundle.assign(multilevel_values),
+        "assign(flat)": lambda: bundle.assign(flat_values, multilevel=False),
+        "all_signals()": lambda: list(bundle.all_signals()),
+        "compiled reader": lambda: reader(),
+        "compiled writer": lambda: writer(values),
+        "set_all(0)": lambda: bundle.set_all(0),
+        "randomize_all()": lambda: bundle.randomize_all(),
+        "randomize_all(getrandbits)": lambda: bundle.randomize_all(
+            random_func=random.getrandbits
+        ),
+        "snapshot()": lambda: bundle.snapshot(),
+        "snapshot().diff(prev)": lambda: bundle.snapshot().diff(prev_snapshot),
+    }
+
+    print(f"{'operation':>28} | {'us/call':>10}")
+    print("-" * 41)
+    for name, func in cases.items():
+        count = max(iterations // 20, 1) if name == "bind" else iterations
+        print(f"{name:>28} | {timeit(func, count) * 1e6:>10.1f}")
+
+    print()
+    print(f"{'history of 1000 cycles':>28} | {'bytes':>10}")
+    print("-" * 41)
+    print(
+        f"{'as_dict()':>28} | {deep_sizeof([bundle.as_dict() for _ in range(1000)]):>10}"
+    )
+    print(
+        f"{'snapshot()':>28} | {deep_sizeof([bundle.snapshot() for _ in range(1000)]):>10}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Benchmark sampling the delay lines of a pipeline model.
+#
+# There are `signals` source signals, each read by three delayers of depth up to `depth`. The per-delayer list that
+# Delayer used before (append plus pop(0)) is measured as a reference.
+#
+# Usage:
+#     python benchmarks/bench_delayer.py [signals] [depth] [cycles]
+import sys
+import time
+
+from toffee.delay import DelayLines
+
+
+class FakeSignal:
+    def __init__(self):
+        self.value = 0
+
+
+def main():
+    signals = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    cycles = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    sources = [FakeSignal() for _ in range(signals)]
+    delays = [depth // 4, depth // 2, depth]
+
+    delay_lines = DelayLines()
+    for source in sources:
+        for delay in delays:
+            delay_lines.add(source, delay)
+
+    start = time.perf_counter()
+    for _ in range(cycles):
+        delay_lines.sample_all()
+    elapsed = time.perf_counter() - start
+    print(f"{'delay lines':>16} | {elapsed / cycles * 1e6:>10.1f} us/cycle")
+
+    value_lists = [([], source, delay) for source in sources for delay in delays]
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for value_list, source, delay in value_lists:
+            if len(value_list) >= delay + 1:
+                value_list.pop(0)
+            value_list.append(source.value)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-delayer list':>16} | {elapsed / cycles * 1e6:>10.1f} us/cycle")
+
+
+if __name__ == "__main__":
+    main()
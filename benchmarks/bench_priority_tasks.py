@@ -0,0 +1,58 @@
+# Benchmark the execution of priority tasks, which run the driver and monitor hooks of the reference models.
+#
+# In every cycle, thousands of hooks with random priorities between 0 and 99 are registered and executed in priority
+# order, as happens in environments with many reference models.
+#
+# Usage:
+#     python benchmarks/bench_priority_tasks.py [cycles]
+import asyncio
+import random
+import sys
+import time
+
+import toffee
+from toffee import executor
+
+
+class FakeDUT:
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    def Step(self, cycles): ...
+
+
+def measure(hooks_per_cycle, cycles):
+    priorities = [random.randint(0, 99) for _ in range(hooks_per_cycle)]
+
+    async def hook():
+        pass
+
+    async def bench():
+        dut = FakeDUT()
+        toffee.start_clock(dut)
+
+        start = time.perf_counter()
+        for _ in range(cycles):
+            for priority in priorities:
+                executor.add_priority_task(hook(), priority)
+            await toffee.ClockCycles(dut)
+        return (time.perf_counter() - start) / cycles
+
+    return toffee.run(bench)
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    toffee.setup_logging(toffee.WARNING)
+
+    print(f"{'hooks/cycle':>11} | {'us/cycle':>10} | {'us/hook':>8}")
+    print("-" * 35)
+    for hooks_per_cycle in [100, 1000, 5000, 10000]:
+        per_cycle = measure(hooks_per_cycle, cycles) * 1e6
+        print(
+            f"{hooks_per_cycle:>11} | {per_cycle:>10.1f} | {per_cycle / hooks_per_cycle:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
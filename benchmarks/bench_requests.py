@@ -0,0 +1,79 @@
+# Benchmark replaying stimulus through Bundle.process_requests.
+#
+# Each request writes the two inputs of an adder and returns the bundle values. The same stimulus is also replayed as
+# columns through Bundle.process_columns.
+#
+# Usage:
+#     python benchmarks/bench_requests.py [requests]
+import array
+import sys
+import time
+
+import toffee
+from toffee import Bundle
+from toffee import Signals
+
+
+class FakeXData: ...
+
+
+class FakePin:
+    def __init__(self):
+        self.xdata, self.event, self.value, self.mIOType = FakeXData(), None, 0, 0
+
+    def IsOutIO(self):
+        return False
+
+
+class AdderDUT:
+    def __init__(self):
+        self.io_a, self.io_b, self.io_cin = FakePin(), FakePin(), FakePin()
+        self.io_sum, self.io_cout = FakePin(), FakePin()
+        self.on_rise = None
+        self.cycle = 0
+
+    def StepRis(self, func):
+        self.on_rise = func
+
+    def Step(self, ncycles):
+        for _ in range(ncycles):
+            self.cycle += 1
+            self.on_rise(self.cycle)
+            self.io_sum.value = self.io_a.value + self.io_b.value + self.io_cin.value
+
+
+class AdderBundle(Bundle):
+    a, b, cin, sum, cout = Signals(5)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    toffee.setup_logging(toffee.WARNING)
+
+    bundle = AdderBundle.from_prefix("io_").bind(AdderDUT())
+    requests = [
+        {"a": i, "b": i + 1, "*": 0, "__return_bundles__": bundle} for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    bundle.process_requests(requests)
+    elapsed = time.perf_counter() - start
+
+    print(f"{count} requests in {elapsed:.3f}s, {elapsed / count * 1e6:.2f} us/request")
+
+    bundle = AdderBundle.from_prefix("io_").bind(AdderDUT())
+    inputs = {
+        "a": array.array("Q", range(count)),
+        "b": array.array("Q", range(1, count + 1)),
+        "cin": array.array("Q", bytes(8 * count)),
+    }
+
+    start = time.perf_counter()
+    bundle.process_columns(inputs)
+    elapsed = time.perf_counter() - start
+
+    print(f"{count} rows in {elapsed:.3f}s, {elapsed / count * 1e6:.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmark the per-cycle overhead of the toffee schedulers.
+#
+# A fake DUT is clocked for a fixed number of cycles while a growing number of idle tasks wait on an event that is
+# never set. The "scan" scheduler walks all tasks on every settle iteration, while the "ready_queue" scheduler only
+# checks the runnable ones, so its per-cycle overhead should stay flat as idle tasks are added.
+#
+# Usage:
+#     python benchmarks/bench_scheduler.py [cycles]
+import asyncio
+import sys
+import time
+
+import toffee
+
+
+class FakeDUT:
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    def Step(self, cycles): ...
+
+
+def measure(scheduler, idle_tasks, cycles):
+    async def idle(event):
+        await event.wait()
+
+    async def bench():
+        dut = FakeDUT()
+        toffee.start_clock(dut, scheduler=scheduler)
+
+        never_set = toffee.Event()
+        for _ in range(idle_tasks):
+            toffee.create_task(idle(never_set))
+
+        await toffee.ClockCycles(dut, 10)
+
+        # Wait on the clock event directly so that every cycle is settled on its own
+        start = time.perf_counter()
+        for _ in range(cycles):
+            await dut.event.wait()
+        return (time.perf_counter() - start) / cycles
+
+    return toffee.run(bench)
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    toffee.setup_logging(toffee.WARNING)
+
+    print(
+        f"{'idle tasks':>10} | {'scan (us/cycle)':>16} | {'ready_queue (us/cycle)':>22}"
+    )
+    print("-" * 56)
+    for idle_tasks in [10, 100, 1000, 10000]:
+        scan = measure("scan", idle_tasks, cycles) * 1e6
+        ready_queue = measure("ready_queue", idle_tasks, cycles) * 1e6
+        print(f"{idle_tasks:>10} | {scan:>16.2f} | {ready_queue:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import asyncio
+
+import toffee
+from base import Adder
+from base import AdderBundle
+from toffee import *
+
+
+def run_adder_sequence(scheduler):
+    results = []
+
+    async def my_test():
+        dut = Adder()
+        toffee.start_clock(dut, scheduler=scheduler)
+        bundle = AdderBundle.from_prefix("io_").bind(dut)
+
+        async def idle_task(event):
+            await event.wait()
+
+        idle_event = Event()
+        for _ in range(100):
+            create_task(idle_task(idle_event))
+
+        async def producer(queue):
+            for i in range(8):
+                await queue.put(i)
+                await ClockCycles(dut)
+
+        queue = Queue()
+        create_task(producer(queue))
+
+        for _ in range(8):
+            item = await queue.get()
+            bundle.a.value = item
+            bundle.b.value = item
+            await bundle.step()
+            results.append((item, bundle.sum.value))
+
+    toffee.run(my_test)
+    return results
+
+
+def test_ready_queue_scheduler():
+    assert run_adder_sequence("ready_queue") == run_adder_sequence("scan")
+    assert run_adder_sequence("ready_queue") == [(i, 2 * i) for i in range(8)]
+
+
+class CountingDUT:
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.steps = []
+        self.value = 0
+
+    def Step(self, cycles):
+        self.steps.append(cycles)
+
+
+def test_batched_stepping():
+    async def my_test():
+        dut = CountingDUT()
+        toffee.start_clock(dut)
+
+        await ClockCycles(dut, 1000)
+        assert sum(dut.steps) == 1000
+        assert len(dut.steps) < 10
+
+        # A task waiting on the clock event directly needs every cycle
+        async def wait_every_cycle():
+            for _ in range(5):
+                await dut.event.wait()
+
+        dut.steps.clear()
+        create_task(wait_every_cycle())
+        await ClockCycles(dut, 10)
+        assert dut.steps[:5] == [1] * 5
+        assert sum(dut.steps) == 10
+
+        # Delayers sample every cycle
+        dut.steps.clear()
+        toffee.Delayer(dut, 1)
+        await ClockCycles(dut, 10)
+        assert dut.steps == [1] * 10
+
+    toffee.run(my_test)
+
+
+def test_batched_stepping_keeps_callbacks_every_cycle():
+    from toffee import asynchronous
+
+    calls = []
+
+    async def count_cycle():
+        calls.append(1)
+        return False
+
+    async def my_test():
+        dut = CountingDUT()
+        toffee.start_clock(dut)
+
+        # A callback runs on every cycle unless it says otherwise
+        handle = asynchronous.add_callback(count_cycle)
+        await ClockCycles(dut, 100)
+        assert dut.steps == [1] * 100 and len(calls) >= 100
+        asynchronous.remove_callback(handle)
+
+        dut.steps.clear()
+        asynchronous.add_callback(count_cycle, every_cycle=False)
+        await ClockCycles(dut, 100)
+        assert sum(dut.steps) == 100 and len(dut.steps) < 10
+
+    toffee.run(my_test)
+
+
+def test_cycle_timer():
+    async def my_test():
+        dut = Adder()
+        toffee.start_clock(dut)
+        bundle = AdderBundle.from_prefix("io_").bind(dut)
+
+        woken = []
+
+        async def waiter(name, ncycles):
+            await ClockCycles(dut, ncycles)
+            woken.append((name, current_cycle()))
+
+        start = current_cycle(dut)
+        for i in range(4):
+            create_task(waiter(f"a{i}", 3))
+        create_task(waiter("b", 1))
+
+        await bundle.step(5)
+        assert current_cycle(bundle) == start + 5
+        assert current_cycle(dut.io_a) == start + 5
+        assert woken == [("b", start + 1)] + [(f"a{i}", start + 3) for i in range(4)]
+
+    toffee.run(my_test)
+
+
+def test_multi_clock_domains():
+    edges = []
+
+    async def my_test():
+        fast, medium, slow = CountingDUT(), CountingDUT(), CountingDUT()
+        toffee.start_clock(fast)
+        toffee.start_clock(medium, period=2)
+        toffee.start_clock(slow, period=3)
+
+        async def log_edges(name, dut, ncycles):
+            for _ in range(ncycles):
+                await dut.event.wait()
+                edges.append((name, current_cycle(fast)))
+
+        await gather(
+            log_edges("fast", fast, 6),
+            log_edges("medium", medium, 3),
+            log_edges("slow", slow, 2),
+        )
+
+        # Idle domains are stepped in batches on the shared timeline
+        await ClockCycles(slow, 100)
+        assert current_cycle(slow) == 102
+        assert current_cycle(medium) == 153
+        assert current_cycle(fast) == 306
+        assert len(slow.steps) < 10
+
+    toffee.run(my_test)
+
+    assert sorted(edges, key=lambda edge: edge[1]) == [
+        ("fast", 1),
+        ("fast", 2),
+        ("medium", 2),
+        ("fast", 3),
+        ("slow", 3),
+        ("fast", 4),
+        ("medium", 4),
+        ("fast", 5),
+        ("fast", 6),
+        ("medium", 6),
+        ("slow", 6),
+    ]
+
+
+def test_lockstep_duts():
+    started_at = []
+
+    class MyComponent(toffee.asynchronous.Component):
+        def __init__(self, dut):
+            super().__init__()
+            self.dut = dut
+
+        async def main(self):
+            started_at.append(current_cycle(self.dut))
+
+    async def my_test():
+        core, cache = Adder(), CountingDUT()
+        toffee.start_clock(core, cache)
+        MyComponent(cache)
+
+        bundle = AdderBundle.from_prefix("io_").bind(core)
+        for i in range(5):
+            bundle.a.value = i
+            await ClockCycles(cache)
+            assert current_cycle(core) == current_cycle(cache) == i + 1
+            assert core.io_sum.value == i
+
+        await ClockCycles(core, 50)
+        assert current_cycle() == current_cycle(cache) == 55
+        assert sum(cache.steps) == 55
+
+    toffee.run(my_test)
+    assert started_at == [1]
+
+
+def test_callbacks_are_scoped_to_the_test():
+    from toffee import asynchronous
+    from toffee.delay import DelayLines
+
+    calls = []
+
+    async def count_cycle():
+        calls.append(1)
+        return False
+
+    async def my_test():
+        dut = Adder()
+        toffee.start_clock(dut)
+        handle = asynchronous.add_callback(count_cycle)
+        delayer = Delayer(dut.io_a, 2)
+        await ClockCycles(dut, 3)
+        assert calls and isinstance(asyncio.get_event_loop().delay_lines, DelayLines)
+
+        asynchronous.remove_callback(handle)
+        calls.clear()
+        delayer.close()
+        await ClockCycles(dut, 3)
+        assert not calls and len(asyncio.get_event_loop().delay_lines) == 0
+
+        # Left registered when the test finishes
+        asynchronous.add_callback(count_cycle)
+        return asyncio.get_event_loop(), Delayer(dut.io_b, 2)
+
+    loop, delayer = toffee.run(my_test)
+    assert not loop.callback_list and not hasattr(loop, "delay_lines")
+    assert count_cycle not in [func for func, _, _, _ in asynchronous.callback_list]
+
+
+def test_clock_profiler(tmp_path):
+    async def my_test():
+        dut = Adder()
+        toffee.start_clock(dut)
+        delayer = Delayer(dut.io_a, 1)
+
+        with ClockProfiler() as profiler:
+            await ClockCycles(dut, 10)
+        await ClockCycles(dut, 10)
+        delayer.close()
+        return profiler
+
+    profiler = toffee.run(my_test)
+    assert 10 <= len(profiler.records) <= 11
+    assert {"dut_step", "user_coroutines", "process_delayer"} <= set(profiler.phases)
+    assert all(
+        rounds >= 1 and iterations >= 1 for _, rounds, iterations, _ in profiler.records
+    )
+    assert "process_delayer" in profiler.summary()
+
+    profiler.dump_csv(tmp_path / "cycles.csv")
+    lines = (tmp_path / "cycles.csv").read_text().splitlines()
+    assert lines[0].startswith("cycle,settle_rounds,settle_iterations,dut_step")
+    assert len(lines) == len(profiler.records) + 1
+
+    profiler.dump_folded(tmp_path / "cycles.folded")
+    assert (
+        "clock_loop;settle;callbacks;process_delayer"
+        in (tmp_path / "cycles.folded").read_text()
+    )
@@ -1,3 +1,5 @@
+import random
+
 import toffee
 from toffee import *
 
@@ -203,3 +205,434 @@ def test_bundle_list():
     bundle.assign(
         {"c": 1, "d": 2, "vec": [{"a": 3, "b": 4}, {"a": 5, "b": 6}]}, multilevel=False
     )
+
+
+def test_bundle_layout_cache():
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_x_a, self.io_y_a = FakePin(), FakePin(), FakePin()
+
+    class SubBundle(Bundle):
+        a = Signal()
+
+    class TopBundle(Bundle):
+        a = Signal()
+
+        def __init__(self):
+            super().__init__()
+            self.x = SubBundle.from_prefix("x_")
+
+    bundle = TopBundle.from_prefix("io_")
+    assert list(bundle.all_signals_rule()) == ["a", "x.a"]
+
+    # Adding a sub-bundle after the layout is cached changes the structure
+    bundle.y = SubBundle.from_prefix("y_")
+    assert list(bundle.all_signals_rule()) == ["a", "x.a", "y.a"]
+
+    bundle.bind(MyDUT())
+    bundle.assign({"a": 1, "x.a": 2, "y.a": 3}, multilevel=False)
+    assert bundle.as_dict() == {"a": 1, "x": {"a": 2}, "y": {"a": 3}}
+
+    del bundle.y
+    assert bundle.as_dict() == {"a": 1, "x": {"a": 2}}
+
+
+def test_compiled_reader_writer():
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_vec_0, self.io_vec_1 = FakePin(), FakePin(), FakePin()
+            self.io_sub_a, self.io_sub_b = FakePin(), FakePin()
+
+    class SubBundle(Bundle):
+        a, b = Signals(2)
+
+    class TopBundle(Bundle):
+        a = Signal()
+        vec = SignalList("vec_#", 2)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    bundle = TopBundle.from_prefix("io_").bind(MyDUT())
+
+    writer = bundle.compile_writer(["sub.b", "a", "vec[1]"])
+    writer((1, 2, 3))
+    assert bundle.as_dict() == {"a": 2, "vec": [None, 3], "sub": {"a": None, "b": 1}}
+
+    reader = bundle.compile_reader(["a", "sub.b"])
+    assert reader() == (2, 1)
+    assert reader.as_dict() == {"a": 2, "sub.b": 1}
+
+    reader = bundle.compile_reader()
+    assert reader.keys == ("a", "vec[0]", "vec[1]", "sub.a", "sub.b")
+    assert reader() == (2, None, 3, None, 1)
+
+    try:
+        bundle.compile_reader(["c"])
+        assert False, "unknown signal should not be compiled"
+    except AssertionError as e:
+        assert "not found" in str(e)
+
+
+def test_bundle_snapshot():
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_b = FakePin(), FakePin()
+            self.io_sub_a, self.io_sub_b = FakePin(), FakePin()
+
+    class SubBundle(Bundle):
+        a, b = Signals(2)
+
+    class TopBundle(Bundle):
+        a, b = Signals(2)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    bundle = TopBundle.from_prefix("io_").bind(MyDUT())
+    bundle.assign({"a": 0, "b": 0, "sub": {"a": 0, "b": 0}})
+
+    prev = bundle.snapshot()
+    assert prev.keys == ("a", "b", "sub.a", "sub.b")
+    assert prev.as_dict() == {"a": 0, "b": 0, "sub.a": 0, "sub.b": 0}
+    assert bundle.snapshot().diff(prev) == {}
+
+    bundle.b.value = 3
+    bundle.sub.a.value = 1 << 70
+    snapshot = bundle.snapshot()
+    assert len(snapshot) == 4
+    assert snapshot["sub.a"] == 1 << 70
+    assert snapshot.diff(prev) == {"b": (0, 3), "sub.a": (0, 1 << 70)}
+    assert prev.diff(snapshot) == {"b": (3, 0), "sub.a": (1 << 70, 0)}
+
+    # Rebinding a sub-bundle drops the signals cached by its parent
+    class SubDUT(FakeDUT):
+        def __init__(self):
+            self.sub_a, self.sub_b = FakePin(), FakePin()
+
+    sub_dut = SubDUT()
+    bundle.sub.bind(sub_dut)
+    sub_dut.sub_b.value = 5
+    assert bundle.snapshot().as_dict() == {"a": 0, "b": 3, "sub.a": None, "sub.b": 5}
+    assert bundle.as_dict() == {"a": 0, "b": 3, "sub": {"a": None, "b": 5}}
+
+
+def test_set_all_and_randomize_all():
+    class WritablePin(FakePin):
+        def __init__(self, width, out=False):
+            super().__init__()
+            self.value, self.width, self.out, self.writes = 0, width, out, 0
+
+        def __setattr__(self, name, value):
+            if name == "value" and "writes" in self.__dict__:
+                self.__dict__["writes"] += 1
+            super().__setattr__(name, value)
+
+        def IsOutIO(self):
+            return self.out
+
+        def W(self):
+            return self.width
+
+        def AsImmWrite(self): ...
+
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_b = WritablePin(4), WritablePin(0)
+            self.io_o = WritablePin(8, out=True)
+            self.io_sub_a = WritablePin(70)
+
+    class SubBundle(Bundle):
+        a = Signal()
+
+    class TopBundle(Bundle):
+        a, b, o = Signals(3)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    dut = MyDUT()
+    bundle = TopBundle.from_prefix("io_").bind(dut)
+
+    bundle.set_all(1)
+    assert (dut.io_a.value, dut.io_b.value, dut.io_o.value) == (1, 1, 0)
+    assert dut.io_sub_a.value == 1
+
+    bundle.set_write_mode_as_imme()
+    bundle.set_all(1)
+    assert dut.io_a.writes == 1
+    bundle.set_all(2)
+    assert dut.io_a.writes == 2
+
+    for _ in range(20):
+        bundle.randomize_all(exclude_signals=["b"])
+        assert 0 <= dut.io_a.value < 16
+        assert 0 <= dut.io_sub_a.value < 2**70
+        assert dut.io_b.value == 2 and dut.io_o.value == 0
+
+    bundle.randomize_all(value_range=(5, 5))
+    assert (dut.io_a.value, dut.io_b.value, dut.io_sub_a.value) == (5, 5, 5)
+
+    bundle.randomize_all(random_func=lambda low, high: high)
+    assert (dut.io_a.value, dut.io_b.value) == (15, 1)
+    assert dut.io_sub_a.value == 2**70 - 1
+
+    # The default draws the same values as random.randint on each writable signal, so seeded stimulus is kept
+    random.seed(1)
+    bundle.randomize_all()
+    values = (dut.io_a.value, dut.io_b.value, dut.io_sub_a.value)
+    random.seed(1)
+    expected = tuple(random.randint(0, 2**width - 1) for width in (4, 1, 70))
+    assert values == expected
+
+    random.seed(1)
+    bundle.randomize_all(random_func=random.getrandbits)
+    random.seed(1)
+    expected = tuple(random.getrandbits(width) for width in (4, 1, 70))
+    assert (dut.io_a.value, dut.io_b.value, dut.io_sub_a.value) == expected
+
+    # After a sub-bundle is rebound, the pins of the old DUT are no longer written
+    class SubDUT(FakeDUT):
+        def __init__(self):
+            self.sub_a = WritablePin(3)
+
+    sub_dut = SubDUT()
+    old_value = dut.io_sub_a.value
+    bundle.sub.bind(sub_dut)
+    bundle.set_all(5)
+    assert sub_dut.sub_a.value == 5 and dut.io_sub_a.value == old_value
+    bundle.randomize_all(random_func=lambda low, high: high)
+    assert sub_dut.sub_a.value == 7 and dut.io_sub_a.value == old_value
+
+
+def test_dut_signal_table():
+    from toffee.bundle import DutSignalTable
+
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.a_x, self.a_y, self.ab_x, self.b_x = [FakePin() for _ in range(4)]
+
+    dut = MyDUT()
+    table = DutSignalTable.of(dut)
+    assert DutSignalTable.of(dut) is table
+    assert [s["name"] for s in table.with_prefix("a_")] == ["a_x", "a_y"]
+    assert [s["name"] for s in table.with_prefix("a")] == ["a_x", "a_y", "ab_x"]
+    assert table.with_prefix("c") == []
+    assert [s["name"] for s in table.with_names(["b_x", "a_x", "c"])] == ["a_x", "b_x"]
+
+    class XYBundle(Bundle):
+        x, y = Signals(2)
+
+    bundle = XYBundle.from_prefix("a_").bind(dut)
+    assert bundle.x is dut.a_x and bundle.y is dut.a_y
+    bundle = XYBundle.from_dict({"x": "ab_x", "y": "a_y"}).bind(dut)
+    assert bundle.x is dut.ab_x and bundle.y is dut.a_y
+    bundle = XYBundle.from_regex(r"^b_(.*)$").bind(dut)
+    assert bundle.x is dut.b_x
+
+
+def test_bind_cache(tmp_path):
+    import json
+
+    class MyDUT(FakeDUT):
+        def __init__(self):
+            self.io_x, self.io_y, self.io_sub_x = FakePin(), FakePin(), FakePin()
+            self.io_vec_0, self.io_vec_1 = FakePin(), FakePin()
+
+    class SubBundle(Bundle):
+        x = Signal()
+
+    class TopBundle(Bundle):
+        x, y, z = Signals(3)
+        vec = SignalList("vec_#", 2)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    dut = MyDUT()
+    set_bind_cache_dir(tmp_path)
+    try:
+        bundle = TopBundle.from_prefix("io_").bind(dut)
+        (cache_file,) = tmp_path.glob("*.json")
+        mapping = json.loads(cache_file.read_text())
+        assert mapping == {
+            "x": "io_x",
+            "y": "io_y",
+            "vec[0]": "io_vec_0",
+            "vec[1]": "io_vec_1",
+            "sub.x": "io_sub_x",
+        }
+
+        # A second bind loads the mapping from the cache
+        mapping["x"] = "io_y"
+        cache_file.write_text(json.dumps(mapping))
+        cached = TopBundle.from_prefix("io_").bind(dut)
+        assert cached.x is dut.io_y and cached.y is dut.io_y
+        assert cached.vec[1] is dut.io_vec_1 and cached.sub.x is dut.io_sub_x
+        assert isinstance(cached.z, DummySignal)
+
+        # A different bundle structure does not hit the cache
+        other = TopBundle.from_prefix("io_")
+        other.sub = SubBundle.from_prefix("vec_")
+        other.bind(dut)
+        assert other.x is dut.io_x and isinstance(other.sub.x, DummySignal)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+    finally:
+        set_bind_cache_dir(None)
+
+    assert bundle.x is dut.io_x and bundle.sub.x is dut.io_sub_x
+
+
+def test_dut_all_signals_memoized():
+    class CountingDUT(FakeDUT):
+        scans = 0
+
+        def __dir__(self):
+            CountingDUT.scans += 1
+            return super().__dir__()
+
+    dut = CountingDUT()
+    signals = list(Bundle.dut_all_signals(dut))
+    assert [s["name"] for s in signals] == [
+        "io_a",
+        "io_b",
+        "io_c_1",
+        "io_c_2",
+        "io_d_1",
+        "io_d_2",
+    ]
+
+    signals[0]["name"] = "changed"
+    assert next(Bundle.dut_all_signals(dut))["name"] == "io_a"
+
+    Bundle.new_class_from_list(["a", "b"]).from_prefix("io_").bind(dut)
+    Bundle.detect_unconnected_signals(dut)
+    Bundle.detect_multiple_connections(dut)
+    assert CountingDUT.scans == 1
+
+
+def test_process_requests():
+    class IOPin(FakePin):
+        def __init__(self, out=False):
+            super().__init__()
+            self.out = out
+
+        def IsOutIO(self):
+            return self.out
+
+    class StepDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_b, self.io_sum = IOPin(), IOPin(), IOPin(out=True)
+            self.io_sub_c = IOPin()
+            self.cycle, self.on_rise = 0, None
+
+        def StepRis(self, func):
+            self.on_rise = func
+
+        def Step(self, ncycles):
+            for _ in range(ncycles):
+                self.cycle += 1
+                self.on_rise(self.cycle)
+                self.io_sum.value = (self.io_a.value or 0) + (self.io_b.value or 0)
+
+    class SubBundle(Bundle):
+        c = Signal()
+
+    class AdderBundle(Bundle):
+        a, b, sum = Signals(3)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    dut = StepDUT()
+    bundle = AdderBundle.from_prefix("io_").bind(dut)
+
+    requests = [
+        {"a": 1, "b": 2},
+        {"a": 3, "b": 4, "__return_bundles__": bundle},
+        None,
+        lambda cycle, bundle: {"a": cycle, "b": 0, "sub": {"c": 7}},
+        {
+            "*": 0,
+            "a": 5,
+            "__condition_func__": lambda cycle, bundle, args: cycle >= args,
+            "__condition_args__": 7,
+            "__funcs__": [lambda cycle, bundle: cycle, None],
+            "__return_bundles__": [bundle.sub, bundle],
+        },
+    ]
+    ret = bundle.process_requests(requests)
+
+    assert ret == [
+        {
+            "data": {"a": 3, "b": 4, "sum": 3, "sub": {"c": None}},
+            "cycle": 2,
+            "__funcs_return__": None,
+        },
+        {
+            "data": [{"c": 0}, {"a": 5, "b": 0, "sum": 4, "sub": {"c": 0}}],
+            "cycle": 7,
+            "__funcs_return__": [7, None],
+        },
+    ]
+    assert requests[1]["__return_cycles__"] == 2
+    assert dut.cycle == 7
+
+    # The return bundles are read from the DUT a sub-bundle is rebound to
+    sub_dut = FakeDUT()
+    sub_dut.sub_c = IOPin()
+    sub_dut.sub_c.value = 9
+    bundle.sub.bind(sub_dut)
+    (ret,) = bundle.process_requests([{"__return_bundles__": bundle}])
+    assert ret["data"]["sub"] == {"c": 9}
+
+
+def test_process_columns():
+    import array
+
+    class StepDUT(FakeDUT):
+        def __init__(self):
+            self.io_a, self.io_b, self.io_sum = FakePin(), FakePin(), FakePin()
+            self.io_sub_c = FakePin()
+            self.cycle, self.on_rise = 0, None
+
+        def StepRis(self, func):
+            self.on_rise = func
+
+        def Step(self, ncycles):
+            for _ in range(ncycles):
+                self.cycle += 1
+                self.on_rise(self.cycle)
+                self.io_sum.value = self.io_a.value + self.io_b.value
+
+    class SubBundle(Bundle):
+        c = Signal()
+
+    class AdderBundle(Bundle):
+        a, b, sum = Signals(3)
+
+        def __init__(self):
+            super().__init__()
+            self.sub = SubBundle.from_prefix("sub_")
+
+    dut = StepDUT()
+    bundle = AdderBundle.from_prefix("io_").bind(dut)
+
+    outputs = bundle.process_columns(
+        {"a": [1, 2, 3], "b": array.array("Q", [10, 20, 30]), "sub.c": [0, 1 << 70, 2]},
+        ["a", "sum", "sub.c"],
+    )
+    assert outputs["a"] == array.array("Q", [1, 2, 3])
+    assert list(outputs["sum"]) == [None, 11, 22]
+    assert outputs["sub.c"] == [0, 1 << 70, 2]
+    assert dut.cycle == 3
+
+    outputs = bundle.process_columns({}, ncycles=2)
+    assert list(outputs) == ["a", "b", "sum", "sub.c"]
+    assert list(outputs["sum"]) == [33, 33]
+    assert dut.cycle == 5
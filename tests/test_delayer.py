@@ -43,3 +43,69 @@ async def test_delayer():
             assert delayed_b.value is None
         else:
             assert delayed_b.value == dut.b.value - 3
+
+
+def test_delay_lines():
+    from toffee.delay import DelayLines
+
+    signal = FakeXData()
+    delay_lines = DelayLines()
+    line = delay_lines.add(signal, 2)
+    assert delay_lines.add(signal, 1) is line and line.depth == 2
+
+    for i in range(5):
+        signal.value = i
+        delay_lines.sample_all()
+    assert [line.value(d) for d in range(4)] == [4, 3, 2, None]
+
+    # Extending keeps the samples already taken
+    delay_lines.add(signal, 4)
+    assert [line.value(d) for d in range(5)] == [4, 3, 2, None, None]
+    for i in range(5, 8):
+        signal.value = i
+        delay_lines.sample_all()
+    assert [line.value(d) for d in range(6)] == [7, 6, 5, 4, 3, None]
+
+
+@toffee_test.testcase
+async def test_delayers_share_history():
+    dut = DUT()
+    dut.event.clear()
+    toffee.start_clock(dut)
+
+    delayed_a = toffee.Delayer(dut.a, 1)
+    for i in range(5):
+        dut.a.value = i
+        await ClockCycles(dut)
+
+    # A new delayer of the same signal reads the history that is already kept
+    delayed_a_3 = toffee.Delayer(dut.a, 3)
+    assert delayed_a.value == 3 and delayed_a_3.value is None
+    assert delayed_a.value_list == [3, 4]
+
+    for i in range(5, 8):
+        dut.a.value = i
+        await ClockCycles(dut)
+    assert delayed_a.value == 6 and delayed_a_3.value == 4
+
+
+def test_delayer_release():
+    from toffee.delay import get_delay_lines
+
+    async def my_test():
+        signal = FakeXData()
+        delay_lines = get_delay_lines()
+
+        with toffee.Delayer(signal, 2) as delayed:
+            other = toffee.Delayer(signal, 1)
+            assert len(delay_lines) == 1 and delayed.line.readers == 2
+        assert len(delay_lines) == 1
+
+        other.close()
+        assert len(delay_lines) == 0
+
+        # Closing again does nothing
+        delayed.close()
+        assert len(delay_lines) == 0
+
+    asyncio.run(my_test())
@@ -1,3 +1,6 @@
+import asyncio
+import inspect
+
 import toffee
 from base import FDUT
 from toffee import *
@@ -119,3 +122,40 @@ def test_executor_sche_group():
         assert len(exec.get_results()) == 2
 
     toffee.run(my_test)
+
+
+def test_priority_task_queue():
+    from toffee.executor import PriorityTaskQueue
+
+    queue = PriorityTaskQueue()
+    for i, priority in enumerate([5, 1, 99, 1, 0, 5, 1]):
+        queue.push((priority, i), priority)
+
+    assert len(queue) == 7
+    popped = [queue.pop() for _ in range(len(queue))]
+    assert popped == [(0, 4), (1, 1), (1, 3), (1, 6), (5, 0), (5, 5), (99, 2)]
+    assert len(queue) == 0
+
+
+def test_driver_of_coro():
+    from toffee.executor import get_driver_of_coro
+
+    agent = MyAgent(FDUT(), [])
+
+    async def not_a_driver(): ...
+
+    driver_coro = agent.driver1()
+    plain_coro = not_a_driver()
+
+    assert driver_coro.__name__ == "driver1"
+    assert get_driver_of_coro(driver_coro) is agent.drivers["driver1"]
+    assert get_driver_of_coro(plain_coro) is None
+    assert get_driver_of_coro(1) is None
+
+    driver_coro.close()
+    plain_coro.close()
+    assert get_driver_of_coro(driver_coro) is None
+
+    # Driver methods are still coroutine functions
+    assert inspect.iscoroutinefunction(MyAgent.driver1)
+    assert asyncio.iscoroutinefunction(agent.driver1)
@@ -241,3 +241,194 @@ class TestModelHooks:
             ("model monitor", 3, 3),
             ("model agent1", "adder_agent.monitor", 3, 3),
         ]
+
+
+def test_driver_args_binder():
+    from toffee._base_agent import Driver
+
+    async def drive(self, a, b=2, *, c, d=4): ...
+
+    driver = Driver(drive)
+    get_args_dict = driver._Driver__get_args_dict
+
+    assert get_args_dict((1,), {"c": 3}) == {"a": 1, "b": 2, "c": 3, "d": 4}
+    assert list(get_args_dict((), {"d": 0, "c": 3, "a": 1})) == ["a", "b", "c", "d"]
+    assert get_args_dict((1, 5), {"c": 3, "d": 6}) == {"a": 1, "b": 5, "c": 3, "d": 6}
+
+    for args, kwargs in [((1,), {}), ((1, 2, 3), {"c": 3}), ((1,), {"c": 3, "e": 5})]:
+        try:
+            get_args_dict(args, kwargs)
+            assert False, "invalid call should raise TypeError"
+        except TypeError:
+            pass
+
+    async def drive_var(self, a, *args, **kwargs): ...
+
+    driver = Driver(drive_var)
+    assert driver._Driver__get_args_dict((1, 2), {"x": 3}) == {
+        "a": 1,
+        "args": (2,),
+        "kwargs": {"x": 3},
+    }
+
+
+def test_compare_once_lazy_format():
+    from toffee._compare import compare_once
+    from toffee._compare import compare_stats
+
+    class Item:
+        formatted = 0
+
+        def __eq__(self, other):
+            return True
+
+        def __str__(self):
+            Item.formatted += 1
+            return "Item()"
+
+    toffee.setup_logging(toffee.WARNING)
+    matches = compare_stats["match"]
+
+    compare_once(Item(), Item(), match_detail=True)
+    assert Item.formatted == 0
+    assert compare_stats["match"] == matches + 1
+
+    toffee.setup_logging(toffee.INFO)
+    compare_once(Item(), Item(), match_detail=True)
+    assert Item.formatted == 2
+    toffee.setup_logging(toffee.WARNING)
+
+
+def test_agent_stats():
+    class AdderEnv(Env):
+        def __init__(self, dut):
+            super().__init__()
+            bundle = AdderBundle.from_prefix("io_").bind(dut)
+            self.adder_agent = AdderAgent(bundle)
+
+    class AdderModel(Model):
+        def __init__(self):
+            super().__init__()
+            self.monitor1 = MonitorPort(agent_name="adder_agent", maxsize=2)
+
+        @driver_hook(agent_name="adder_agent")
+        def add(self, a, b):
+            return a + b
+
+    def env_handle():
+        dut = Adder()
+        start_clock(dut)
+        return AdderEnv(dut).attach(AdderModel())
+
+    async def test(env):
+        env.adder_agent.start_monitor("monitor1", maxsize=3)
+        for i in range(5):
+            await env.adder_agent.add(i, i)
+        await ClockCycles(env.adder_agent.bundle, 2)
+        return env
+
+    toffee.setup_logging(toffee.CRITICAL)
+    env = toffee.run(test, env_handle)
+    untimed = env.adder_agent.stats()["drivers"]["add"]
+    assert untimed["calls"] == 5
+    assert untimed["wall_time_in_call"] == 0 and untimed["model_time"] == 0
+
+    toffee.set_agent_timing()
+    try:
+        env = toffee.run(test, env_handle)
+    finally:
+        toffee.set_agent_timing(False)
+    toffee.setup_logging(toffee.WARNING)
+
+    stats = env.adder_agent.stats()
+    driver = stats["drivers"]["add"]
+    assert driver["calls"] == 5 and driver["cycles_per_call"] == 1
+    assert driver["wall_time_in_call"] > 0 and driver["model_time"] > 0
+
+    monitor = stats["monitors"]["monitor1"]
+    assert monitor["items"] >= 5 and monitor["queue_high_water"] == 3
+    assert monitor["dropped"] == monitor["items"] - 3
+
+    all_stats = agent_stats()
+    assert all_stats["drivers"]["adder_agent.add"] == driver
+    port = all_stats["ports"]["adder_agent.monitor1"]
+    assert port["high_water"] == 2 and port["dropped"] == monitor["items"] - 2
+
+
+def test_port_overflow_policies():
+    from toffee.asynchronous import RingBuffer
+    from toffee.logger import stats_handler
+    from toffee.model import Port
+
+    ring = RingBuffer(3)
+    for i in range(3):
+        ring.append(i)
+    assert ring.popleft() == 0
+    ring.append(3)
+    ring.append(4)  # Grows while wrapped around
+    assert list(ring) == [1, 2, 3, 4] and len(ring.buffer) == 6
+
+    async def fill(port, count):
+        for i in range(count):
+            await port.put(i)
+
+    async def my_test():
+        block_port = Port("block_port", maxsize=2, overflow="block")
+        producer = create_task(fill(block_port, 5))
+        await sleep(0)
+        assert block_port.qsize() == 2 and not producer.done()
+        assert [await block_port.get() for _ in range(5)] == list(range(5))
+        await producer
+        assert block_port.high_water == 2 and block_port.dropped == 0
+
+        grow_port = Port("grow_port", maxsize=2, overflow="grow")
+        await fill(grow_port, 5)
+        assert grow_port.qsize() == 5 and grow_port.high_water == 5
+
+        drop_port = Port("drop_port", maxsize=2)
+        await fill(drop_port, 5)
+        assert drop_port.qsize() == 2 and drop_port.dropped == 3
+        assert [await drop_port.get() for _ in range(2)] == [0, 1]
+
+    errors = stats_handler.serverity_stats.get("ERROR", 0)
+    warnings = stats_handler.serverity_stats.get("WARNING", 0)
+    toffee.run(my_test)
+    assert stats_handler.serverity_stats.get("ERROR", 0) == errors + 1
+    assert stats_handler.serverity_stats.get("WARNING", 0) == warnings + 1
+
+
+def test_compare_stats_per_test():
+    import logging
+
+    from toffee._compare import compare_once
+    from toffee._compare import compare_stats
+
+    compare_once(1, 1)
+
+    async def my_test():
+        assert compare_stats == {"match": 0, "mismatch": 0}
+        compare_once(1, 1)
+        compare_once(2, 2)
+
+    class SummaryHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    handler = SummaryHandler()
+    toffee.setup_logging(toffee.INFO, console_display=False)
+    toffee.get_logger().addHandler(handler)
+    try:
+        toffee.run(my_test)
+        assert compare_stats["match"] == 2
+        toffee.run(my_test)
+        assert compare_stats["match"] == 2
+    finally:
+        toffee.setup_logging(toffee.WARNING)
+
+    summaries = [m for m in handler.messages if m.startswith("Log Summary")]
+    assert len(summaries) == 2
+    assert "* Report compare results\nmatch:\t2\nmismatch:\t0\n" in summaries[-1]
@@ -0,0 +1,103 @@
+import asyncio
+
+import toffee
+from toffee import *
+
+
+class FakePin:
+    def __init__(self, event):
+        self.event, self.value = event, 0
+
+
+class CounterDUT:
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.cycle = 0
+        self.count = FakePin(self.event)
+        self.toggle = FakePin(self.event)
+        self.valid = FakePin(self.event)
+
+    def Step(self, cycles):
+        self.cycle += cycles
+        self.count.value = self.cycle
+        self.toggle.value = (self.cycle // 3) % 2
+        self.valid.value = int(self.cycle >= 7)
+
+
+def test_triggers():
+    async def my_test():
+        dut = CounterDUT()
+        toffee.start_clock(dut)
+
+        await Value(dut.count, 5)
+        assert dut.cycle == 5
+
+        await RisingEdge(dut.toggle)
+        assert dut.cycle == 9
+
+        await FallingEdge(dut.toggle)
+        assert dut.cycle == 12
+
+        await Change(dut.toggle)
+        assert dut.cycle == 15
+
+        await AllValid(dut.valid, dut.toggle)
+        assert dut.cycle == 16
+
+        await Condition(dut, lambda dut: dut.count.value % 10 == 0)
+        assert dut.cycle == 20
+
+        # Many waits on the same pins are woken together
+        results = []
+
+        async def wait_value(value):
+            await Value(dut.count, value)
+            results.append((value, dut.cycle))
+
+        for value in [30, 25, 25]:
+            create_task(wait_value(value))
+        await ClockCycles(dut, 12)
+        assert results == [(25, 25), (25, 25), (30, 30)]
+
+    toffee.run(my_test)
+
+
+def test_triggers_see_writes_of_the_same_cycle():
+    async def my_test():
+        dut = CounterDUT()
+        toffee.start_clock(dut)
+        pin = FakePin(dut.event)
+        flag = []
+        results = {}
+
+        async def writer():
+            await ClockCycles(dut, 3)
+            pin.value = 5
+            flag.append(True)
+            await ClockCycles(dut, 3)
+            pin.value = 0
+
+        async def wait_for(name, trigger):
+            await trigger
+            results[name] = dut.cycle
+
+        create_task(writer())
+        create_task(wait_for("value", Value(pin, 5)))
+        create_task(wait_for("all_valid", AllValid(pin)))
+        create_task(wait_for("condition", Condition(dut, lambda dut: flag)))
+        create_task(wait_for("change", Change(pin)))
+        create_task(wait_for("rising_edge", RisingEdge(pin)))
+        create_task(wait_for("falling_edge", FallingEdge(pin)))
+        await ClockCycles(dut, 10)
+
+        # The same cycles as checking the values on every edge in the waiting tasks
+        assert results == {
+            "value": 3,
+            "all_valid": 3,
+            "condition": 3,
+            "change": 3,
+            "rising_edge": 3,
+            "falling_edge": 6,
+        }
+
+    toffee.run(my_test)
@@ -7,6 +7,8 @@ from .executor import *
 from .funcov import *
 from .logger import *
 from .model import *
+from .profiler import *
+from .trace import *
 from .triggers import *
 from .utils import *
 
@@ -22,4 +24,6 @@ __all__ = (
     + env.__all__
     + utils.__all__
     + delay.__all__
+    + trace.__all__
+    + profiler.__all__
 )
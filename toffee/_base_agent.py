@@ -4,13 +4,35 @@ __all__ = [
 ]
 
 import inspect
+import time
+import weakref
+
+from ._clock import get_clock
 from .asynchronous import create_task
 from .asynchronous import Event
-from .asynchronous import Queue
+from .asynchronous import RingQueue
 from .asynchronous import gather
 from ._compare import compare_once
 from .executor import add_priority_task
-from .logger import error
+
+# All drivers and monitors that are alive in the order they are created, so that their statistics can be collected
+agent_registry = weakref.WeakKeyDictionary()
+
+# Whether the drivers and monitors measure the wall time of their calls and model hooks, see set_agent_timing
+agent_timing = False
+
+
+def agent_cycle(agent):
+    """
+    Get the current cycle of the clock driving the bundle of an agent.
+
+    Returns:
+        The current cycle, or None if the bundle of the agent is not driven by a clock.
+    """
+
+    bundle = getattr(agent, "bundle", None)
+    clock = get_clock(getattr(bundle, "_Bundle__clock_event", None))
+    return clock.cycle if clock is not None else None
 
 
 class BaseAgent:
@@ -22,6 +44,18 @@ class BaseAgent:
         self.compare_func = compare_func
         self.model_infos = {}
 
+        self.calls = 0
+        # Seconds from the start of each call to its return
+        self.wall_time_in_call = 0.0
+        self.model_time = 0.0  # Seconds spent in the model hooks
+
+        agent_registry[self] = None
+
+    def get_path(self):
+        """Get the path of the method, or its name if the agent is not in an env."""
+
+        return getattr(self, "path", "") or self.name
+
 
 class Driver(BaseAgent):
     """
@@ -35,6 +69,57 @@ class Driver(BaseAgent):
         self.sche_order = None
         self.priority = None
 
+        self.cycles = 0  # Cycles spent in the driver method
+
+        self.__compile_args_binder()
+
+    def get_stats(self):
+        """
+        Get the statistics of the driver.
+
+        Returns:
+            A dictionary of the number of calls, the cycles spent in the driver method in total and per call, and the
+            seconds spent in the model hooks and from the start of each call to its return. The latter is wall time,
+            so it also covers the other coroutines and the DUT steps in the cycles of the call. Both times stay 0 unless
+            agent timing is enabled.
+        """
+
+        return {
+            "calls": self.calls,
+            "cycles": self.cycles,
+            "cycles_per_call": self.cycles / self.calls if self.calls else 0.0,
+            "wall_time_in_call": self.wall_time_in_call,
+            "model_time": self.model_time,
+        }
+
+    def __compile_args_binder(self):
+        """
+        Analyse the signature of the driver function once, so that the args dictionary of each call can be assembled
+        without going through inspect.
+        """
+
+        self.__signature = inspect.signature(self.func)
+        parameters = list(self.__signature.parameters.values())
+        self.__self_name = parameters[0].name if parameters else None
+
+        # Only plain parameters are bound by the fast binder, others go through the signature
+        self.__fast_binder = all(
+            parameter.kind
+            in (
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                inspect.Parameter.KEYWORD_ONLY,
+            )
+            for parameter in parameters
+        )
+
+        parameters = parameters[1:]
+        self.__arg_names = tuple(parameter.name for parameter in parameters)
+        self.__arg_defaults = tuple(parameter.default for parameter in parameters)
+        self.__max_positional_args = sum(
+            parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+            for parameter in parameters
+        )
+
     def __get_args_dict(self, arg_list, kwarg_list):
         """
         Get the args and kwargs in the form of dictionary.
@@ -47,21 +132,40 @@ class Driver(BaseAgent):
             The args and kwargs in the form of dictionary.
         """
 
-        signature = inspect.signature(self.func)
-        bound_args = signature.bind(None, *arg_list, **kwarg_list)
+        if self.__fast_binder and len(arg_list) <= self.__max_positional_args:
+            arguments = dict(zip(self.__arg_names, arg_list))
+            used_kwargs = 0
+
+            for index in range(len(arg_list), len(self.__arg_names)):
+                name = self.__arg_names[index]
+                if name in kwarg_list:
+                    arguments[name] = kwarg_list[name]
+                    used_kwargs += 1
+                elif self.__arg_defaults[index] is not inspect.Parameter.empty:
+                    arguments[name] = self.__arg_defaults[index]
+                else:
+                    break
+            else:
+                if used_kwargs == len(kwarg_list):
+                    return arguments
+
+        # Unusual signatures and invalid calls are handled by the signature, which also raises the proper errors
+        bound_args = self.__signature.bind(None, *arg_list, **kwarg_list)
         bound_args.apply_defaults()
         arguments = bound_args.arguments
-        del arguments["self"]
+        del arguments[self.__self_name]
         return arguments
 
-    async def __drive_single_model_ports(self, model_info, arg_list, kwarg_list):
+    async def __drive_single_model_ports(self, model_info, args_dict):
         for agent_port in model_info["agent_port"]:
-            args_dict = self.__get_args_dict(arg_list, kwarg_list)
-            await agent_port.put((self.path, args_dict))
+            await agent_port.put((self.path, dict(args_dict)))
 
         if model_info["driver_port"] is not None:
-            args_dict = self.__get_args_dict(arg_list, kwarg_list)
-            args = next(iter(args_dict.values())) if len(args_dict) == 1 else args_dict
+            args = (
+                next(iter(args_dict.values()))
+                if len(args_dict) == 1
+                else dict(args_dict)
+            )
             await model_info["driver_port"].put(args)
 
     def __drive_single_driver_hook(
@@ -71,7 +175,10 @@ class Driver(BaseAgent):
             assert False, "driver_hook should not be a coroutine function"
 
         async def driver_hook_wrapper():
+            start = time.perf_counter() if agent_timing else None
             model_results.append((driver_hook, driver_hook(*arg_list, **kwarg_list)))
+            if start is not None:
+                self.model_time += time.perf_counter() - start
 
         event = Event()
         priority = (
@@ -81,19 +188,15 @@ class Driver(BaseAgent):
 
         return event
 
-    def __drive_single_agent_hook(
-        self, agent_hook, model_results, arg_list, kwarg_list
-    ):
+    def __drive_single_agent_hook(self, agent_hook, model_results, args_dict):
         if inspect.iscoroutinefunction(agent_hook):
             assert False, "agent_hook should not be a coroutine function"
 
         async def agent_hook_wrapper():
-            model_results.append(
-                (
-                    agent_hook,
-                    agent_hook(self.path, self.__get_args_dict(arg_list, kwarg_list)),
-                )
-            )
+            start = time.perf_counter() if agent_timing else None
+            model_results.append((agent_hook, agent_hook(self.path, dict(args_dict))))
+            if start is not None:
+                self.model_time += time.perf_counter() - start
 
         event = Event()
         priority = (
@@ -123,9 +226,19 @@ class Driver(BaseAgent):
         dut_first_driver_hooks = []
         dut_first_agent_hooks = []
 
+        # The args dictionary is shared by all ports and agent hooks of this call, each of them gets its own copy
+        args_dict = None
+
         for _, model_info in self.model_infos.items():
+            if args_dict is None and (
+                model_info["driver_port"]
+                or model_info["agent_port"]
+                or model_info["agent_hook"]
+            ):
+                args_dict = self.__get_args_dict(arg_list, kwarg_list)
+
             if model_info["driver_port"] or model_info["agent_port"]:
-                await self.__drive_single_model_ports(model_info, arg_list, kwarg_list)
+                await self.__drive_single_model_ports(model_info, args_dict)
             else:
                 if driver_hook := model_info["driver_hook"]:
                     if (
@@ -147,7 +260,7 @@ class Driver(BaseAgent):
                     ) or self.sche_order == "model_first":
                         model_first_events.append(
                             self.__drive_single_agent_hook(
-                                agent_hook, model_results, arg_list, kwarg_list
+                                agent_hook, model_results, args_dict
                             ).wait()
                         )
                     else:
@@ -157,7 +270,14 @@ class Driver(BaseAgent):
 
         # Execute driver method
 
+        start_cycle = agent_cycle(agent)
+        start_time = time.perf_counter() if agent_timing else None
         dut_result = await self.func(agent, *arg_list, **kwarg_list)
+        if start_time is not None:
+            self.wall_time_in_call += time.perf_counter() - start_time
+        if start_cycle is not None:
+            self.cycles += agent_cycle(agent) - start_cycle
+        self.calls += 1
 
         # Execute dut_first driver hooks and agent hooks
         async def background_exec():
@@ -171,7 +291,7 @@ class Driver(BaseAgent):
             for agent_hook in dut_first_agent_hooks:
                 dut_first_events.append(
                     self.__drive_single_agent_hook(
-                        agent_hook, model_results, arg_list, kwarg_list
+                        agent_hook, model_results, args_dict
                     ).wait()
                 )
             await gather(*dut_first_events)
@@ -205,18 +325,42 @@ class Monitor(BaseAgent):
         self.get_queue = None
         self.agent = agent
 
+        self.items = 0  # Values returned by the monitor method
+
         self.monitor_task = create_task(self.__monitor_forever())
 
-    def enable_get_queue(self, maxsize):
-        self.get_queue = Queue()
-        self.get_queue_max_size = maxsize
+    def enable_get_queue(self, maxsize, overflow="drop"):
+        self.get_queue = RingQueue(maxsize, overflow, self.get_path())
 
     def get_queue_size(self):
         return self.get_queue.qsize() if self.get_queue is not None else 0
 
+    def get_stats(self):
+        """
+        Get the statistics of the monitor.
+
+        Returns:
+            A dictionary of the number of calls, the number of values returned, the seconds spent in the model hooks
+            and from the start of each call to its return, the high-water mark of the get_queue and the number of
+            values dropped. The times are measured as in Driver.get_stats.
+        """
+
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "wall_time_in_call": self.wall_time_in_call,
+            "model_time": self.model_time,
+            "queue_high_water": getattr(self.get_queue, "high_water", 0),
+            "dropped": getattr(self.get_queue, "dropped", 0),
+        }
+
     async def process_monitor_call(self, ret):
         async def async_wrapper(func, *args, **kwargs):
-            return func(*args, **kwargs)
+            start = time.perf_counter() if agent_timing else None
+            result = func(*args, **kwargs)
+            if start is not None:
+                self.model_time += time.perf_counter() - start
+            return result
 
         for model_info in self.model_infos.values():
             for agent_port in model_info["agent_port"]:
@@ -239,14 +383,15 @@ class Monitor(BaseAgent):
         while True:
             await self.agent.monitor_step()
 
+            start_time = time.perf_counter() if agent_timing else None
             ret = await self.func(self.agent)
+            if start_time is not None:
+                self.wall_time_in_call += time.perf_counter() - start_time
+            self.calls += 1
+
             if ret is not None:
+                self.items += 1
                 await self.process_monitor_call(ret)
 
                 if self.get_queue is not None:
-                    if self.get_queue.qsize() >= self.get_queue_max_size:
-                        error(
-                            f"the get_queue in {self.path} is full, the value {ret} is dropped"
-                        )
-                        continue
                     await self.get_queue.put(ret)
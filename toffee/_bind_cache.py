@@ -0,0 +1,98 @@
+__all__ = [
+    "set_bind_cache_dir",
+    "get_bind_cache_dir",
+    "bind_cache_key",
+    "load_bind_mapping",
+    "store_bind_mapping",
+]
+
+import hashlib
+import json
+import os
+import tempfile
+
+__cache_dir = None
+
+
+def set_bind_cache_dir(cache_dir):
+    """
+    Set the directory of the bind cache. When it is set, Bundle.bind stores the signal mapping it resolves, and a
+    later bind of the same bundle structure to a DUT with the same signals loads the mapping instead of matching the
+    signals again.
+
+    Args:
+        cache_dir: The directory of the bind cache. If it is None, the bind cache is disabled.
+    """
+
+    global __cache_dir
+    __cache_dir = None if cache_dir is None else os.fspath(cache_dir)
+
+
+def get_bind_cache_dir():
+    """
+    Get the directory of the bind cache, or None if the bind cache is disabled.
+    """
+
+    return __cache_dir
+
+
+def bind_cache_key(dut_digest, rule_tree):
+    """
+    Get the key of a bind.
+
+    Args:
+        dut_digest: The digest of the signal names of the DUT.
+        rule_tree: A nested tuple describing the structure and the connect rules of the bundle.
+
+    Returns:
+        The key as a hex string.
+    """
+
+    return hashlib.sha256(f"{dut_digest}:{rule_tree!r}".encode()).hexdigest()
+
+
+def load_bind_mapping(key):
+    """
+    Load a mapping from the bind cache.
+
+    Args:
+        key: The key of the bind.
+
+    Returns:
+        A dictionary mapping signal names in the bundle to signal names in the DUT, or None if it is not cached.
+    """
+
+    if __cache_dir is None:
+        return None
+
+    try:
+        with open(os.path.join(__cache_dir, f"{key}.json")) as f:
+            mapping = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return mapping if isinstance(mapping, dict) else None
+
+
+def store_bind_mapping(key, mapping):
+    """
+    Store a mapping to the bind cache. The file is written to a temporary file first and then renamed, so that
+    concurrent test processes never read a partial mapping.
+
+    Args:
+        key: The key of the bind.
+        mapping: A dictionary mapping signal names in the bundle to signal names in the DUT.
+    """
+
+    if __cache_dir is None:
+        return
+
+    os.makedirs(__cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=__cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(mapping, f)
+        os.replace(tmp_path, os.path.join(__cache_dir, f"{key}.json"))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,242 @@
+__all__ = ["Clock", "get_clock", "wait_cycles", "wait_condition"]
+
+import asyncio
+import heapq
+
+
+class Clock:
+    """
+    The clock state kept by the clock loop for a DUT. It counts the cycles the DUT has been stepped and keeps a
+    cycle-indexed timer of the tasks waiting for a number of cycles. Waiters of the same cycle share one timer slot,
+    and on each step only the slots that are due are woken up.
+
+    It also keeps the conditions registered by the triggers. They are checked in one pass per cycle by the clock loop,
+    once the tasks woken up by the step have settled, so a value written by another task in the same cycle is seen
+    in that cycle. Only the tasks whose condition became true are woken up.
+
+    All clocks share one timeline. A clock with a period of p and a phase of q has its edges at the times q + n * p
+    (n >= 1) of the timeline.
+    """
+
+    def __init__(self, dut, period=1, phase=0):
+        assert period > 0, "period must be greater than 0"
+        assert 0 <= phase < period, "phase must be between 0 and period - 1"
+
+        self.dut = dut
+        self.event = dut.event
+        self.cycle = 0
+        self.period = period
+        self.phase = phase
+        self.next_edge_time = period + phase
+
+        self.__timer_slots = {}  # Target cycle -> futures to be woken up in FIFO order
+        self.__timer_cycles = []  # Heap of the target cycles that have a slot
+        # (pins, func, future, cycle registered) checked once per cycle
+        self.__conditions = []
+        # The cycle at which the conditions were last checked
+        self.__checked_cycle = None
+
+    def wait(self, ncycles):
+        """
+        Create a future that is done after the clock advances ncycles.
+
+        Args:
+            ncycles: The number of cycles to wait.
+
+        Returns:
+            The future to be awaited.
+        """
+
+        future = asyncio.get_event_loop().create_future()
+        target_cycle = self.cycle + ncycles
+
+        slot = self.__timer_slots.get(target_cycle)
+        if slot is None:
+            self.__timer_slots[target_cycle] = [future]
+            heapq.heappush(self.__timer_cycles, target_cycle)
+        else:
+            slot.append(future)
+
+        return future
+
+    def wait_condition(self, pins, func):
+        """
+        Create a future that is done in the first later cycle in which the condition is true.
+
+        Args:
+            pins: The pins read by the condition.
+            func: The condition function. It is called with the values of the pins as positional arguments and
+                  returns a boolean.
+
+        Returns:
+            The future to be awaited.
+        """
+
+        future = asyncio.get_event_loop().create_future()
+        self.__conditions.append((pins, func, future, self.cycle))
+        return future
+
+    def next_wake_cycle(self):
+        """
+        Get the earliest cycle at which a waiter needs to be woken up, None if there is no waiter.
+        """
+
+        # Conditions need to be checked on every cycle
+        if self.__conditions:
+            return self.cycle + 1
+
+        return self.__timer_cycles[0] if self.__timer_cycles else None
+
+    def edge_time(self, ncycles):
+        """
+        Get the time on the timeline of the ncycles-th upcoming edge.
+        """
+
+        return self.next_edge_time + (ncycles - 1) * self.period
+
+    def cycles_until(self, time):
+        """
+        Get the number of edges of the clock up to the given time on the timeline.
+        """
+
+        if time < self.next_edge_time:
+            return 0
+        return (time - self.next_edge_time) // self.period + 1
+
+    def has_event_waiters(self):
+        """
+        Check whether any task is waiting on the clock event directly. Such a task expects to be woken up on every
+        cycle. If the event does not expose its waiters, it is assumed to have some.
+        """
+
+        waiters = getattr(self.event, "_waiters", None)
+        return waiters is None or len(waiters) > 0
+
+    def step(self, ncycles=1):
+        """
+        Step the DUT for ncycles, wake up the due timer waiters and trigger the clock event.
+
+        Args:
+            ncycles: The number of cycles to step.
+        """
+
+        self.dut.Step(ncycles)
+        self.cycle += ncycles
+        self.next_edge_time += ncycles * self.period
+
+        while self.__timer_cycles and self.__timer_cycles[0] <= self.cycle:
+            for future in self.__timer_slots.pop(heapq.heappop(self.__timer_cycles)):
+                if not future.done():
+                    future.set_result(None)
+
+        self.event.set()
+        self.event.clear()
+
+    def check_conditions(self):
+        """
+        Check the registered conditions and wake up the tasks whose condition is true. It is called by the clock loop
+        after the tasks of a cycle have settled. The conditions are checked at most once per cycle, and not in the
+        cycle they are registered in. Every pin is read once per pass, no matter how many conditions depend on it.
+
+        Returns:
+            Whether any task is woken up.
+        """
+
+        if not self.__conditions or self.__checked_cycle == self.cycle:
+            return False
+        self.__checked_cycle = self.cycle
+
+        pin_values = {}
+        remaining = []
+        woken = False
+
+        for pins, func, future, cycle in self.__conditions:
+            if future.done():
+                continue
+
+            if cycle == self.cycle:
+                remaining.append((pins, func, future, cycle))
+                continue
+
+            values = []
+            for pin in pins:
+                if id(pin) not in pin_values:
+                    pin_values[id(pin)] = pin.value
+                values.append(pin_values[id(pin)])
+
+            try:
+                satisfied = func(*values)
+            except Exception as e:
+                future.set_exception(e)
+                woken = True
+                continue
+
+            if satisfied:
+                future.set_result(None)
+                woken = True
+            else:
+                remaining.append((pins, func, future, cycle))
+
+        self.__conditions = remaining
+        return woken
+
+
+def get_clock(event):
+    """
+    Get the clock driven by the clock loop whose clock event is event.
+
+    Args:
+        event: The clock event.
+
+    Returns:
+        The clock if the event is driven by a clock loop, None otherwise.
+    """
+
+    clocks = getattr(asyncio.get_event_loop(), "clocks", None)
+    if clocks is None:
+        return None
+    return clocks.get(event, None)
+
+
+async def wait_cycles(event, ncycles):
+    """
+    Wait for the clock event to be triggered ncycles times. If the event is driven by a clock loop, the task is only
+    woken up once, at the target cycle.
+
+    Args:
+        event: The clock event.
+        ncycles: The number of cycles to wait.
+    """
+
+    if ncycles <= 0:
+        return
+
+    clock = get_clock(event)
+    if clock is None:
+        for _ in range(ncycles):
+            await event.wait()
+    else:
+        await clock.wait(ncycles)
+
+
+async def wait_condition(event, pins, func):
+    """
+    Wait until the condition is true after a clock event. If the event is driven by a clock loop, the condition is
+    checked by the clock loop once the other tasks of each cycle have settled, and the task is only woken up once the
+    condition is true.
+
+    Args:
+        event: The clock event.
+        pins: The pins read by the condition.
+        func: The condition function. It is called with the values of the pins as positional arguments and returns a
+              boolean.
+    """
+
+    clock = get_clock(event)
+    if clock is None:
+        while True:
+            await event.wait()
+            if func(*(pin.value for pin in pins)):
+                return
+    else:
+        await clock.wait_condition(pins, func)
@@ -1,8 +1,32 @@
-__all__ = ["compare_once"]
+__all__ = ["compare_once", "compare_stats"]
 
 from .asynchronous import Component
+from .asynchronous import add_setup
 from .asynchronous import asyncio
 from .logger import *
+from .logger import add_summary_hook
+
+# The number of matches and mismatches found by compare_once in the current test
+compare_stats = {"match": 0, "mismatch": 0}
+
+
+def __reset_compare_stats():
+    compare_stats["match"] = 0
+    compare_stats["mismatch"] = 0
+
+
+def __compare_stats_summary():
+    if not (compare_stats["match"] or compare_stats["mismatch"]):
+        return ""
+    return (
+        "* Report compare results\n"
+        f"match:\t{compare_stats['match']}\n"
+        f"mismatch:\t{compare_stats['mismatch']}\n"
+    )
+
+
+add_setup(__reset_compare_stats)
+add_summary_hook(__compare_stats_summary)
 
 
 def __default_compare(item1, item2):
@@ -14,15 +38,20 @@ def compare_once(dut_item, std_item, compare=None, match_detail=False):
         compare = __default_compare
 
     if not compare(dut_item, std_item):
+        compare_stats["mismatch"] += 1
         error(
             f"Mismatch\n----- STDOUT -----\n{std_item}\n----- DUTOUT -----\n{dut_item}\n------------------"
         )
         assert False, f"mismatch: {dut_item} != {std_item}"
     else:
-        if match_detail:
-            info(
-                f"Match\n----- STDOUT -----\n{std_item}\n----- DUTOUT -----\n{dut_item}\n------------------"
-            )
-        else:
-            info("Match")
+        compare_stats["match"] += 1
+
+        # Formatting the items may be expensive, so only do it when the message will be logged
+        if get_logger().isEnabledFor(INFO):
+            if match_detail:
+                info(
+                    f"Match\n----- STDOUT -----\n{std_item}\n----- DUTOUT -----\n{dut_item}\n------------------"
+                )
+            else:
+                info("Match")
         return True
@@ -2,11 +2,17 @@ __all__ = [
     "Agent",
     "driver_method",
     "monitor_method",
+    "agent_stats",
+    "set_agent_timing",
 ]
 
+from . import _base_agent
 from ._base_agent import Driver
 from ._base_agent import Monitor
+from ._base_agent import agent_registry
+from .logger import add_summary_hook
 from .logger import warning
+from .model import port_registry
 
 
 class Agent:
@@ -64,18 +70,38 @@ class Agent:
         monitor = self.monitors[monitor_name]
         return monitor.get_queue_size()
 
-    def start_monitor(self, monitor_name, maxsize=4):
+    def start_monitor(self, monitor_name, maxsize=4, overflow="drop"):
         """
         After monitoring begins, monitor_method places the monitored data in a separate queue. Calling monitor_method
         in a test case will get the monitored data.
 
         Args:
             monitor_name: The name of the monitor.
-            maxsize: The maximum size of the queue.
+            maxsize: The maximum size of the queue. If it is -1, the queue is unbounded.
+            overflow: The policy when the queue is full. If it is "block", the monitor waits until the data is got,
+                      so it skips the cycles in between. If it is "grow", the queue grows and a warning is logged
+                      once. If it is "drop", the data is dropped and counted.
         """
 
         monitor = self.monitors[monitor_name]
-        monitor.enable_get_queue(maxsize)
+        monitor.enable_get_queue(maxsize, overflow)
+
+    def stats(self):
+        """
+        Get the statistics of the drivers and monitors of the agent.
+
+        Returns:
+            A dictionary with the keys "drivers" and "monitors", each maps the method names to their statistics.
+        """
+
+        return {
+            "drivers": {
+                name: driver.get_stats() for name, driver in self.drivers.items()
+            },
+            "monitors": {
+                name: monitor.get_stats() for name, monitor in self.monitors.items()
+            },
+        }
 
     def all_driver_method(self):
         """
@@ -122,6 +148,8 @@ class Agent:
 
 import functools
 
+from .executor import register_driver_code
+
 
 def __driver_wrapped_func(func):
     func.__is_driver_decorated__ = True
@@ -131,6 +159,7 @@ def __driver_wrapped_func(func):
         driver = agent.drivers[func.__name__]
         return await driver.process_driver_call(agent, args, kwargs)
 
+    register_driver_code(wrapper.__code__)
     wrapper.__original_func__ = func
     return wrapper
 
@@ -173,3 +202,71 @@ def monitor_method():
         return __monitor_wrapped_func(func)
 
     return decorator
+
+
+def agent_stats():
+    """
+    Get the statistics of all drivers, monitors and model ports that are alive. If several of them have the same
+    path, the statistics of the last created one are returned.
+
+    Returns:
+        A dictionary with the keys "drivers", "monitors" and "ports", each maps the paths (such as "agent.driver") to
+        their statistics.
+    """
+
+    stats = {"drivers": {}, "monitors": {}, "ports": {}}
+    for agent in list(agent_registry):
+        kind = "drivers" if isinstance(agent, Driver) else "monitors"
+        stats[kind][agent.get_path()] = agent.get_stats()
+    for port in list(port_registry):
+        stats["ports"][port.get_path()] = port.get_stats()
+    return stats
+
+
+def set_agent_timing(enabled=True):
+    """
+    Enable or disable the timing of the drivers and monitors. While it is enabled, each call measures the wall time
+    from its start to its return and the time spent in its model hooks, which adds a few timer reads to every call.
+    It is disabled by default, so the statistics only count calls, cycles and items.
+
+    Args:
+        enabled: Whether to measure the times.
+    """
+
+    _base_agent.agent_timing = enabled
+
+
+def __agent_stats_summary():
+    stats = agent_stats()
+    lines = []
+
+    for path, driver in sorted(stats["drivers"].items()):
+        if driver["calls"]:
+            line = f"{path}:\tcalls={driver['calls']}, cycles/call={driver['cycles_per_call']:.2f}"
+            if driver["wall_time_in_call"] or driver["model_time"]:
+                line += (
+                    f", wall_time_in_call={driver['wall_time_in_call']:.6f}s, "
+                    f"model={driver['model_time']:.6f}s"
+                )
+            lines.append(line)
+    for path, monitor in sorted(stats["monitors"].items()):
+        if monitor["items"]:
+            line = f"{path}:\titems={monitor['items']}"
+            if monitor["model_time"]:
+                line += f", model={monitor['model_time']:.6f}s"
+            lines.append(
+                line
+                + f", queue_high_water={monitor['queue_high_water']}, dropped={monitor['dropped']}"
+            )
+    for path, port in sorted(stats["ports"].items()):
+        if port["high_water"] or port["dropped"]:
+            lines.append(
+                f"port {path}:\thigh_water={port['high_water']}, dropped={port['dropped']}"
+            )
+
+    if not lines:
+        return ""
+    return "* Report statistics by agent\n" + "".join(line + "\n" for line in lines)
+
+
+add_summary_hook(__agent_stats_summary)
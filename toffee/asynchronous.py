@@ -6,15 +6,22 @@ __all__ = [
     "run",
     "gather",
     "start_clock",
+    "current_cycle",
     "main_coro",
 ]
 
 import asyncio
 import inspect
 import sys
+import time
 
+from ._clock import Clock
+from ._clock import get_clock
 from .bundle import Bundle
+from .bundle import DutSignalTable
+from .logger import error
 from .logger import summary
+from .logger import warning
 
 """Asynchronous event definition
 
@@ -25,12 +32,103 @@ Specifically, we need to complete all executable tasks before the next clock eve
 callback_list = []
 
 
-def add_callback(coro, *args, **kwargs):
+def add_callback(coro, *args, every_cycle=True, **kwargs):
     """
     Add a callback function to the callback list.
+
+    A callback added while an event loop is running belongs to that loop, and it is removed when the test run by
+    main_coro finishes. A callback added without a running loop, such as the ones added when a module is imported, is
+    kept for the whole session.
+
+    Args:
+        every_cycle: Whether the callback has to run on every cycle. While such a callback is registered, the clock
+                     loop steps the DUTs one cycle at a time. A callback that sets it to False should register a step
+                     limit with add_step_limit if it needs to stop at some cycles.
+
+    Returns:
+        A handle of the callback, which can be passed to remove_callback.
+    """
+
+    handle = (coro, args, kwargs, every_cycle)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        callback_list.append(handle)
+    else:
+        if not hasattr(loop, "callback_list"):
+            loop.callback_list = []
+        loop.callback_list.append(handle)
+    return handle
+
+
+def remove_callback(handle):
+    """
+    Remove a callback added by add_callback.
+
+    Args:
+        handle: The handle returned by add_callback.
+    """
+
+    loop_callbacks = getattr(asyncio.get_event_loop(), "callback_list", [])
+    for callbacks in (loop_callbacks, callback_list):
+        for i, entry in enumerate(callbacks):
+            if entry is handle:
+                del callbacks[i]
+                return
+    assert False, "The callback is not registered"
+
+
+setup_list = []
+
+
+def add_setup(func, *args, **kwargs):
+    """
+    Add a setup function to the setup list.
+
+    The setup functions are called when main_coro starts a test, before the environment is created, to reset the
+    state that is collected for each test.
+    """
+
+    setup_list.append((func, args, kwargs))
+
+
+cleanup_list = []
+
+
+def add_cleanup(func, *args, **kwargs):
+    """
+    Add a cleanup function to the cleanup list.
+
+    The cleanup functions are called when the test run by main_coro finishes, to release the state the test
+    registered on the event loop, so that it is not carried into the next test run on the same loop.
+    """
+
+    cleanup_list.append((func, args, kwargs))
+
+
+def __cleanup_test(loop):
+    """
+    Release the per-test state of an event loop.
+    """
+
+    if hasattr(loop, "callback_list"):
+        loop.callback_list.clear()
+    for func, args, kwargs in cleanup_list:
+        func(*args, **kwargs)
+
+
+step_limit_list = []
+
+
+def add_step_limit(func, *args, **kwargs):
+    """
+    Add a step limit function to the step limit list.
+
+    Before stepping the DUT, the clock loop calls every step limit function to find how many cycles it is allowed to
+    advance at once. The function should return the maximum number of cycles, or None if it sets no limit.
     """
 
-    callback_list.append((coro, args, kwargs))
+    step_limit_list.append((func, args, kwargs))
 
 
 async def __execute_callback():
@@ -39,11 +137,32 @@ async def __execute_callback():
     """
 
     need_rerun = False
-    for func, args, kwargs in callback_list:
+    for func, args, kwargs, _ in callback_list:
+        need_rerun |= await func(*args, **kwargs)
+    for func, args, kwargs, _ in tuple(
+        getattr(asyncio.get_event_loop(), "callback_list", ())
+    ):
         need_rerun |= await func(*args, **kwargs)
     return need_rerun
 
 
+async def __execute_callback_profiled(times):
+    """
+    Execute the callback functions like __execute_callback, and add the time spent in each of them to times.
+    """
+
+    timer = time.perf_counter
+    need_rerun = False
+    for func, args, kwargs, _ in callback_list + list(
+        getattr(asyncio.get_event_loop(), "callback_list", ())
+    ):
+        start = timer()
+        need_rerun |= await func(*args, **kwargs)
+        phase = func.__name__.strip("_")
+        times[phase] = times.get(phase, 0.0) + timer() - start
+    return need_rerun
+
+
 def task_run():
     """
     Set the flag to indicate that a new task has been run.
@@ -55,6 +174,8 @@ def task_run():
 def __has_unwait_task():
     """
     Detects whether a task exists, is not waiting, or is waiting for an event that has already been triggered.
+
+    This is the "scan" scheduler, it walks all tasks in the event loop, so its cost grows with the number of tasks.
     """
 
     for task in asyncio.all_tasks():
@@ -68,6 +189,28 @@ def __has_unwait_task():
     return False
 
 
+def __has_ready_task():
+    """
+    Detects whether the event loop has any runnable work queued.
+
+    This is the "ready_queue" scheduler. Every wake-up in toffee, whether it comes from an Event, a Queue, a sleep or
+    a clock event, resolves a future and queues the woken task in the ready queue of the event loop. Since the clock
+    loop is the task being executed, the ready queue only holds work that other tasks still have to do, and checking
+    it costs O(1) regardless of how many idle tasks exist.
+    """
+
+    ready = getattr(asyncio.get_event_loop(), "_ready", None)
+
+    # Fall back to the scan scheduler if the event loop does not expose a ready queue
+    if ready is None:
+        return __has_unwait_task()
+
+    return len(ready) > 0
+
+
+SCHEDULERS = ("scan", "ready_queue")
+
+
 async def __run_once():
     """
     The event loop executes one round.
@@ -82,11 +225,38 @@ async def __other_tasks_done():
     """
     Wait for all tasks to complete. This means that all tasks are waiting at this time, and there are no tasks that
     can be executed.
+
+    Returns:
+        The number of rounds the event loop executed.
     """
 
+    loop = asyncio.get_event_loop()
+    has_pending_task = (
+        __has_ready_task
+        if getattr(loop, "scheduler", "scan") == "ready_queue"
+        else __has_unwait_task
+    )
+
+    rounds = 1
     await __run_once()
-    while __has_unwait_task() or asyncio.get_event_loop().new_task_run:
+    while has_pending_task() or loop.new_task_run:
+        rounds += 1
         await __run_once()
+    return rounds
+
+
+def __check_clock_conditions(loop):
+    """
+    Check the conditions registered on the clocks by the triggers, once the tasks of the cycle have settled.
+
+    Returns:
+        Whether any task is woken up, so that the tasks need to be settled again.
+    """
+
+    woken = False
+    for clock in getattr(loop, "clocks", {}).values():
+        woken |= clock.check_conditions()
+    return woken
 
 
 async def cancel_all_tasks():
@@ -101,12 +271,15 @@ async def cancel_all_tasks():
 
 
 async def execute_all_coros():
+    loop = asyncio.get_event_loop()
     while True:
         await __other_tasks_done()
+        if __check_clock_conditions(loop):
+            continue
         if not (await __execute_callback()):
             break
 
-    if asyncio.get_event_loop().test_done:
+    if loop.test_done:
         await cancel_all_tasks()
         await asyncio.sleep(0)
         return
@@ -130,8 +303,8 @@ class Queue(asyncio.Queue):
     Change the function in the Queue to meet the asynchronous requirements.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
 
     async def put(self, item):
         await super().put(item)
@@ -143,6 +316,111 @@ class Queue(asyncio.Queue):
         return ret
 
 
+class RingBuffer:
+    """
+    A FIFO kept in a preallocated list. It only grows, by doubling, when an item is appended while it is full.
+    """
+
+    __slots__ = ("buffer", "head", "size")
+
+    def __init__(self, capacity):
+        self.buffer = [None] * max(capacity, 1)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        buffer = self.buffer
+        for i in range(self.head, self.head + self.size):
+            yield buffer[i % len(buffer)]
+
+    def append(self, item):
+        if self.size == len(self.buffer):
+            self.buffer = list(self) + [None] * len(self.buffer)
+            self.head = 0
+        self.buffer[(self.head + self.size) % len(self.buffer)] = item
+        self.size += 1
+
+    def popleft(self):
+        item = self.buffer[self.head]
+        self.buffer[self.head] = None
+        self.head = (self.head + 1) % len(self.buffer)
+        self.size -= 1
+        return item
+
+
+OVERFLOW_POLICIES = ("block", "grow", "drop")
+
+
+class RingQueue(Queue):
+    """
+    A Queue stored in a preallocated ring buffer, with a policy for the items put while it already holds maxsize
+    items:
+
+    - "block": the put waits until an item is got, so the producer is held back.
+    - "grow": the item is kept and the buffer grows, a warning is logged the first time.
+    - "drop": the item is dropped and counted in dropped, an error is logged for the first dropped item only.
+    """
+
+    kind = "queue"
+
+    def __init__(self, maxsize=-1, overflow="drop", name=""):
+        """
+        Args:
+            maxsize: The maximum size of the queue. If it is -1, the queue is unbounded.
+            overflow: The overflow policy, it can be "block", "grow" or "drop".
+            name: The name of the queue used in the log messages.
+        """
+
+        assert (
+            maxsize > 0 or maxsize == -1
+        ), "maxsize must be greater than 0 or equal to -1"
+        assert (
+            overflow in OVERFLOW_POLICIES
+        ), f"overflow must be one of {OVERFLOW_POLICIES}"
+
+        self.limit = maxsize
+        self.overflow = overflow
+        self.name = name
+        self.high_water = 0
+        self.dropped = 0
+
+        super().__init__(maxsize if overflow == "block" and maxsize > 0 else 0)
+
+    def get_path(self):
+        return self.name
+
+    def _init(self, maxsize):
+        self._queue = RingBuffer(self.limit if self.limit > 0 else 16)
+
+    def _put(self, item):
+        self._queue.append(item)
+
+    def _get(self):
+        return self._queue.popleft()
+
+    async def put(self, item):
+        if self.limit != -1 and self.qsize() >= self.limit:
+            if self.overflow == "drop":
+                self.dropped += 1
+                if self.dropped == 1:
+                    error(
+                        f"the {self.kind} {self.get_path()} is full, values put into it are dropped "
+                        "from now on"
+                    )
+                return
+            if self.overflow == "grow" and self.high_water == self.limit:
+                warning(
+                    f"the {self.kind} {self.get_path()} grows beyond its maxsize {self.limit}"
+                )
+
+        await super().put(item)
+        if self.qsize() > self.high_water:
+            self.high_water = self.qsize()
+
+
 async def sleep(delay: float):
     """
     Change the implementation of the sleep function to meet the asynchronous requirements.
@@ -158,35 +436,185 @@ Using the asynchronous event logic defined above, the external asynchronous inte
 """
 
 
-async def __clock_loop(dut):
+def __next_step_time(loop):
+    """
+    Find the time on the shared timeline to which the clocks can be advanced at once.
+
+    A clock does not need to stop at the edges that nothing in Python observes. When no task waits on its clock event
+    directly, no wall-clock timer is pending, no callback has to run on every cycle and no step limit applies, it only
+    needs to stop at the earliest cycle at which a task has to be woken up. The timeline is advanced to the earliest stop among all clocks, or to the next
+    edge if no clock needs to stop.
+    """
+
+    clocks = loop.clocks.values()
+    next_edge_time = min(clock.next_edge_time for clock in clocks)
+
+    if getattr(loop, "_scheduled", True) or loop.global_clock_event._waiters:
+        return next_edge_time
+
+    for callbacks in (callback_list, getattr(loop, "callback_list", ())):
+        if any(every_cycle for _, _, _, every_cycle in callbacks):
+            return next_edge_time
+
+    limit = None
+    for func, args, kwargs in step_limit_list:
+        func_limit = func(*args, **kwargs)
+        if func_limit is not None:
+            limit = func_limit if limit is None else min(limit, func_limit)
+
+    step_time = None
+    for clock in clocks:
+        wake_cycle = clock.next_wake_cycle()
+        if clock.has_event_waiters():
+            ncycles = 1
+        elif wake_cycle is not None:
+            ncycles = wake_cycle - clock.cycle
+        else:
+            continue
+
+        if limit is not None:
+            ncycles = min(ncycles, limit)
+
+        clock_step_time = clock.edge_time(max(ncycles, 1))
+        if step_time is None or clock_step_time < step_time:
+            step_time = clock_step_time
+
+    return next_edge_time if step_time is None else step_time
+
+
+def __step_clocks(loop):
+    """
+    Advance the shared timeline, only the clocks whose edges fall in the advanced time are stepped. The global clock
+    event is triggered once all of them have been stepped.
+    """
+
+    step_time = __next_step_time(loop)
+    for clock in list(loop.clocks.values()):
+        ncycles = clock.cycles_until(step_time)
+        if ncycles > 0:
+            clock.step(ncycles)
+
+    loop.global_clock_event.set()
+    loop.global_clock_event.clear()
+
+
+async def __profiled_clock_step(loop, profiler):
+    """
+    Execute one step of the clock loop, and record the time spent in each phase to the profiler.
+    """
+
+    timer = time.perf_counter
+    times = {}
+    rounds = iterations = 0
+    while True:
+        start = timer()
+        rounds += await __other_tasks_done()
+        times["user_coroutines"] = times.get("user_coroutines", 0.0) + timer() - start
+        if __check_clock_conditions(loop):
+            continue
+        iterations += 1
+        if not (await __execute_callback_profiled(times)):
+            break
+
+    if loop.test_done:
+        await cancel_all_tasks()
+        await asyncio.sleep(0)
+
+    start = timer()
+    __step_clocks(loop)
+    times["dut_step"] = timer() - start
+
+    cycle = next(iter(loop.clocks.values())).cycle
+    profiler.record(cycle, rounds, iterations, times)
+
+
+async def __clock_loop():
     """
     The clock loop function, which is the main loop of the asynchronous event.
     """
 
     # Make sure main_coro executes first
-    while not hasattr(asyncio.get_event_loop(), "test_done"):
+    loop = asyncio.get_event_loop()
+    while not hasattr(loop, "test_done"):
         await asyncio.sleep(0)
 
     while True:
-        await execute_all_coros()
-        dut.Step(1)
-        dut.event.set()
-        dut.event.clear()
+        profiler = getattr(loop, "profiler", None)
+        if profiler is None:
+            await execute_all_coros()
+            __step_clocks(loop)
+        else:
+            await __profiled_clock_step(loop, profiler)
 
 
 create_task = asyncio.create_task
 
 
-def start_clock(dut):
+def start_clock(dut, *duts, scheduler=None, period=1, phase=0):
     """
-    Start a clock loop on a DUT.
+    Start a clock loop on one or more DUTs.
+
+    All the clocks started in an event loop are driven by one clock loop on a shared timeline, so DUTs in different
+    clock domains can be simulated together. The clock of the DUT has its edges at the times phase + n * period
+    (n >= 1) of the timeline. In each step of the timeline only the clocks that have an edge are stepped, and all
+    tasks are settled once. The DUTs passed in the same call share the same period and phase, so they are stepped in
+    lockstep.
+
+    Args:
+        dut: The DUT to be clocked. It can be any object with a Step method and an event.
+        duts: Other DUTs to be clocked in lockstep with dut.
+        scheduler: The scheduler used to detect when all tasks have settled in a clock cycle. It can be "scan" or
+                   "ready_queue". The "scan" scheduler checks every task in the event loop, while the "ready_queue"
+                   scheduler only looks at the tasks that are runnable, so its cost does not depend on the number of
+                   idle tasks. If it is None, the scheduler of the event loop is left unchanged.
+        period: The period of the clock on the shared timeline.
+        phase: The phase of the clock on the shared timeline, it should be less than the period.
     """
-    # When start_clock is called, global_clock_event points to the clock event in the dut
+
     loop = asyncio.get_event_loop()
-    loop.global_clock_event = dut.event
 
-    task = create_task(__clock_loop(dut))
-    task.set_name("__clock_loop")
+    if scheduler is not None:
+        assert scheduler in SCHEDULERS, f"scheduler must be one of {SCHEDULERS}"
+        loop.scheduler = scheduler
+
+    # The first clock starts the clock loop, the others join its timeline. global_clock_event is triggered after
+    # every step of the timeline.
+    clock_loop_task = getattr(loop, "clock_loop_task", None)
+    if clock_loop_task is None or clock_loop_task.done():
+        loop.clocks = {}
+        loop.global_clock_event = asyncio.Event()
+        loop.clock_loop_task = create_task(__clock_loop())
+        loop.clock_loop_task.set_name("__clock_loop")
+
+    for clocked_dut in (dut,) + duts:
+        assert (
+            clocked_dut.event not in loop.clocks
+        ), "the clock of the DUT is already started"
+        loop.clocks[clocked_dut.event] = Clock(clocked_dut, period, phase)
+
+
+def current_cycle(item=None):
+    """
+    Get the number of cycles a clock has advanced since start_clock was called.
+
+    Args:
+        item: The item whose clock is read. It can be a dut, a bundle, an xpin or a clock event. If it is None, the
+              clock of the first started DUT is read.
+
+    Returns:
+        The current cycle of the clock.
+    """
+
+    if item is None:
+        event = next(iter(getattr(asyncio.get_event_loop(), "clocks", {})), None)
+    elif isinstance(item, Bundle):
+        event = item._Bundle__clock_event
+    else:
+        event = getattr(item, "event", item)
+
+    clock = get_clock(event)
+    assert clock is not None, "the item is not driven by a clock started by start_clock"
+    return clock.cycle
 
 
 def set_clock_event(dut, loop):
@@ -200,7 +628,7 @@ def set_clock_event(dut, loop):
     dut.xclock._step_event = new_event
     dut.event = new_event
 
-    for xpin_info in Bundle.dut_all_signals(dut):
+    for xpin_info in DutSignalTable.of(dut).signals:
         xpin = xpin_info["signal"]
         xpin.event = new_event
 
@@ -233,28 +661,34 @@ async def main_coro(test, env_handle=None):
     loop.set_exception_handler(handle_exception)
     loop.new_task_run = False
     loop.test_done = False
-    if not hasattr(loop, "delayer_list"):
-        loop.delayer_list = []
+    if not hasattr(loop, "scheduler"):
+        loop.scheduler = "scan"
 
     asyncio.current_task().set_name("main_coro")
 
-    if env_handle:
-        args = env_handle()
-        if not isinstance(args, tuple):
-            args = (args,)
-        ret = await create_task(test(*args))
-    else:
-        if inspect.iscoroutine(test):
-            ret = await test
+    for func, args, kwargs in setup_list:
+        func(*args, **kwargs)
+
+    try:
+        if env_handle:
+            args = env_handle()
+            if not isinstance(args, tuple):
+                args = (args,)
+            ret = await create_task(test(*args))
         else:
-            ret = await test()
+            if inspect.iscoroutine(test):
+                ret = await test
+            else:
+                ret = await test()
 
-    loop.test_done = True
+        loop.test_done = True
 
-    # Wait for the last clock event to complete all outstanding tasks during the period
-    loop = asyncio.get_event_loop()
-    if hasattr(loop, "global_clock_event"):
-        await loop.global_clock_event.wait()
+        # Wait for the last clock event to complete all outstanding tasks during the period
+        loop = asyncio.get_event_loop()
+        if hasattr(loop, "global_clock_event"):
+            await loop.global_clock_event.wait()
+    finally:
+        __cleanup_test(loop)
 
     summary()
 
@@ -271,7 +705,7 @@ def run(test, env_handle=None, dut=None):
                 env_handle is provided, the test will be called with the env_handle's return value. when the env_handle
                 is set, make sure the test is a function and has the same number of arguments as the env_handle's
                 return.
-        dut: The DUT object.
+        dut: The DUT object, or a list of DUT objects if several DUTs are clocked.
 
     Returns:
         The result of the coroutine (or function).
@@ -287,7 +721,8 @@ def run(test, env_handle=None, dut=None):
     ), "Your current version of python is less than 3.10.1, need to provide the dut parameter"
 
     loop = asyncio.get_event_loop()
-    set_clock_event(dut, loop)
+    for single_dut in dut if isinstance(dut, (list, tuple)) else [dut]:
+        set_clock_event(single_dut, loop)
     result = loop.run_until_complete(coro)
     return result
 
@@ -6,18 +6,31 @@ __all__ = [
     "Signals",
     "SignalList",
     "BundleList",
+    "DutSignalTable",
+    "set_bind_cache_dir",
 ]
 
+import array
+import collections
+import bisect
+import hashlib
+import operator
 import random
 import re
+import weakref
 from enum import Enum
-from queue import Queue
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Union
 
 from ._base import MObject
+from ._bind_cache import bind_cache_key
+from ._bind_cache import get_bind_cache_dir
+from ._bind_cache import load_bind_mapping
+from ._bind_cache import set_bind_cache_dir
+from ._bind_cache import store_bind_mapping
+from ._clock import wait_cycles
 from .logger import *
 
 
@@ -154,6 +167,384 @@ class BundleList:
         return bundle_list
 
 
+class BundleLayout:
+    """
+    The structure of a bundle: the names of its signal placeholders, sub-bundles, signal lists and bundle lists. Names
+    are kept in the order of dir(), which is the order bundles have always been traversed in.
+    """
+
+    def __init__(self, bundle):
+        self.signals = []
+        self.sub_bundles = []
+        self.signal_lists = []
+        self.bundle_lists = []
+
+        for attr in dir(bundle):
+            value = getattr(bundle, attr)
+            if isinstance(value, Signal):
+                self.signals.append(attr)
+            elif isinstance(value, Bundle):
+                self.sub_bundles.append(attr)
+            elif isinstance(value, SignalList):
+                self.signal_lists.append(attr)
+            elif isinstance(value, BundleList):
+                self.bundle_lists.append(attr)
+
+        self.sub_bundle_set = frozenset(self.sub_bundles)
+        self.signal_list_set = frozenset(self.signal_lists)
+        self.bundle_list_set = frozenset(self.bundle_lists)
+        self.names = self.sub_bundle_set | self.signal_list_set | self.bundle_list_set
+
+        # Caches of the bound signals, filled on first use. They are valid for one bind version of Bundle
+        self.bind_version = None
+        self.snapshot_reader = None
+        self.writable_signals = None
+        self.writable_widths = None
+        self.dict_reader = None
+
+
+class BundleReader:
+    """
+    A compiled reader of a bundle. The signal names are resolved to the signals once, and each call reads all of them
+    in one pass.
+    """
+
+    __get_value = operator.attrgetter("value")
+
+    def __init__(self, keys, signals):
+        self.keys = tuple(keys)
+        self.signals = tuple(signals)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    def __call__(self):
+        """
+        Read the signals.
+
+        Returns:
+            A tuple of the signal values, in the order of the keys.
+        """
+
+        return tuple(map(BundleReader.__get_value, self.signals))
+
+    def as_dict(self):
+        """
+        Read the signals into a flat dictionary, whose keys are the signal names.
+        """
+
+        return dict(zip(self.keys, map(BundleReader.__get_value, self.signals)))
+
+    def snapshot(self):
+        """
+        Read the signals into a BundleSnapshot.
+        """
+
+        return BundleSnapshot(self, map(BundleReader.__get_value, self.signals))
+
+
+class BundleSnapshot:
+    """
+    The values of the signals in a bundle at one moment. The values are kept in a flat array whose order is given
+    by the reader, and the signal names are shared by all snapshots taken by the same reader.
+    """
+
+    __slots__ = ("reader", "values")
+
+    def __init__(self, reader, values):
+        self.reader = reader
+        values = tuple(values)
+        try:
+            self.values = array.array("Q", values)
+        except (OverflowError, TypeError):
+            # Values wider than 64 bits or not integers
+            self.values = values
+
+    @property
+    def keys(self):
+        return self.reader.keys
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        return self.values[self.reader.index[key]]
+
+    def as_dict(self):
+        """
+        Convert the snapshot into a flat dictionary, whose keys are the signal names.
+        """
+
+        return dict(zip(self.keys, self.values))
+
+    def diff(self, other):
+        """
+        Compare the snapshot with another snapshot of the same signals.
+
+        Args:
+            other: The snapshot to compare with, usually the one taken in the previous cycle.
+
+        Returns:
+            A dictionary mapping the name of each changed signal to a tuple of its value in other and its value in
+            this snapshot.
+        """
+
+        assert (
+            self.reader is other.reader or self.keys == other.keys
+        ), "snapshots must be taken from the same signals"
+
+        if self.values == other.values:
+            return {}
+
+        keys = self.keys
+        return {
+            keys[i]: (old, new)
+            for i, (old, new) in enumerate(zip(other.values, self.values))
+            if old != new
+        }
+
+
+class BundleWriter:
+    """
+    A compiled writer of a bundle. The signal names are resolved to the signals once, and each call writes all of them
+    in one pass.
+    """
+
+    def __init__(self, keys, signals):
+        self.keys = tuple(keys)
+        self.signals = tuple(signals)
+
+    def __call__(self, values):
+        """
+        Write the signals.
+
+        Args:
+            values: A sequence of values, in the order of the keys.
+        """
+
+        assert len(values) == len(
+            self.signals
+        ), "values length must match the number of keys"
+        for signal, value in zip(self.signals, values):
+            signal.value = value
+
+
+class BundleRequest:
+    """
+    A request of Bundle.process_requests, parsed when it is submitted. The special keys are taken out of the request
+    dictionary and the remaining keys are resolved to write targets, so nothing has to be looked up when the request
+    is processed on the rising edge. Requests with the same keys share one tuple of targets.
+    """
+
+    __slots__ = (
+        "source",
+        "condition_func",
+        "condition_args",
+        "targets",
+        "values",
+        "funcs",
+        "return_readers",
+        "funcs_return",
+        "return_values",
+        "return_cycle",
+    )
+
+    # Kinds of writes
+    WRITE_SIGNAL = 0
+    ASSIGN = 1
+    SET_ALL = 2
+
+    def __init__(self, source):
+        self.source = source
+        self.condition_func = None
+        self.condition_args = None
+        self.targets = ()
+        self.values = ()
+        self.funcs = (None,)
+        self.return_readers = None
+        self.funcs_return = None
+        self.return_values = None
+        self.return_cycle = None
+
+    def run(self, cycle, bundle):
+        """
+        Write the signals, call the callbacks and read the return bundles.
+
+        Args:
+            cycle: The cycle of the rise.
+            bundle: The bundle processing the request.
+        """
+
+        for (kind, target), value in zip(self.targets, self.values):
+            if kind == BundleRequest.WRITE_SIGNAL:
+                target.value = value
+            elif kind == BundleRequest.ASSIGN:
+                target(value)
+            else:
+                target.set_all(value)
+
+        funcreturns = [
+            func(cycle, bundle) if callable(func) else None for func in self.funcs
+        ]
+        if len(funcreturns) == 1:
+            funcreturns = funcreturns[0]
+
+        if self.return_readers is None:
+            return
+        ret_data = [reader() for reader in self.return_readers]
+        if len(ret_data) == 1:
+            ret_data = ret_data[0]
+
+        self.funcs_return = funcreturns
+        self.return_values = ret_data
+        self.return_cycle = cycle
+
+
+class BundleBatchRequest:
+    """
+    A batch of requests of Bundle.process_columns, given as columns. It stays at the head of the request queue and
+    handles one row on each rising edge: the input signals are written and then the output signals are sampled.
+    """
+
+    __slots__ = ("signals", "columns", "return_signals", "return_columns", "remaining")
+
+    def __init__(self, signals, columns, return_signals, ncycles):
+        self.signals = signals
+        self.columns = [BundleBatchRequest.__column_iter(column) for column in columns]
+        self.return_signals = return_signals
+        self.return_columns = [[] for _ in return_signals]
+        self.remaining = ncycles
+
+    @staticmethod
+    def __column_iter(column):
+        if hasattr(column, "tolist") and not isinstance(
+            column, (array.array, memoryview)
+        ):
+            # Such as numpy arrays, convert the items to python ints before writing
+            column = column.tolist()
+        return iter(column)
+
+    def run_cycle(self):
+        """
+        Handle the next row.
+
+        Returns:
+            True if all rows have been handled.
+        """
+
+        for signal, column in zip(self.signals, self.columns):
+            signal.value = next(column)
+        for signal, return_column in zip(self.return_signals, self.return_columns):
+            return_column.append(signal.value)
+
+        self.remaining -= 1
+        return self.remaining == 0
+
+
+class DutSignalTable:
+    """
+    The signals of a DUT, indexed by name. Signals are kept in the order of dir(), which is sorted by name, so the
+    signals with a given prefix can be found by binary search.
+
+    A table is built once for each DUT by DutSignalTable.of and shared by everything that enumerates the signals of
+    that DUT, such as Bundle.bind, Bundle.dut_all_signals and start_clock. Each signal is a dictionary containing the
+    name, original name, and signal of the signal, and should not be modified.
+
+    >>> table = DutSignalTable.of(dut)
+    >>> table.by_name["io_a"]["signal"] is dut.io_a
+    True
+    """
+
+    __tables = weakref.WeakKeyDictionary()
+
+    def __init__(self, signals):
+        self.signals = list(signals)
+        self.names = [signal["name"] for signal in self.signals]
+        self.by_name = {signal["name"]: signal for signal in self.signals}
+        self.__digest = None
+        self.__names_by_id = None
+
+    @staticmethod
+    def of(dut):
+        """
+        Get the signal table of a DUT, building it on first use.
+
+        Args:
+            dut: The dut to get the signal table of.
+
+        Returns:
+            The signal table of the DUT.
+        """
+
+        try:
+            table = DutSignalTable.__tables.get(dut)
+        except TypeError:
+            # The dut cannot be weakly referenced, so its table is not kept
+            return DutSignalTable(DutSignalTable.scan(dut))
+
+        if table is None:
+            table = DutSignalTable(DutSignalTable.scan(dut))
+            DutSignalTable.__tables[dut] = table
+        return table
+
+    @staticmethod
+    def scan(dut):
+        """
+        Scan the attributes of a DUT for signals.
+
+        Args:
+            dut: The dut to scan.
+
+        Returns:
+            A generator of dictionaries containing the name, original name, and signal of the signal.
+        """
+
+        is_instance_of_xpin = Bundle._Bundle__is_instance_of_xpin
+        for attr in dir(dut):
+            signal = getattr(dut, attr)
+            if not callable(signal) and is_instance_of_xpin(signal):
+                yield {"name": attr, "org_name": attr, "signal": signal}
+
+    def digest(self):
+        """
+        Get a digest of the signal names, computed once.
+        """
+
+        if self.__digest is None:
+            self.__digest = hashlib.sha256("\n".join(self.names).encode()).hexdigest()
+        return self.__digest
+
+    def names_by_id(self):
+        """
+        Get a dictionary mapping the id of each signal to its name, built once.
+        """
+
+        if self.__names_by_id is None:
+            self.__names_by_id = {
+                id(signal["signal"]): signal["name"] for signal in self.signals
+            }
+        return self.__names_by_id
+
+    def with_prefix(self, prefix):
+        """
+        Get the signals whose names start with the prefix, in the order of the table.
+        """
+
+        if prefix == "":
+            return list(self.signals)
+
+        start = bisect.bisect_left(self.names, prefix)
+        end = start
+        while end < len(self.names) and self.names[end].startswith(prefix):
+            end += 1
+        return self.signals[start:end]
+
+    def with_names(self, names):
+        """
+        Get the signals with the given names that exist in the table, in the order of the table.
+        """
+
+        return [self.by_name[name] for name in sorted(set(names) & self.by_name.keys())]
+
+
 class BindMethod(MObject):
     """
     A bind method is a way to connect signals to a bundle.
@@ -184,6 +575,20 @@ class BindMethod(MObject):
 
         raise NotImplementedError
 
+    def select(self, table):
+        """
+        Select the signals of a DUT that could be matched by this method, so that the signals that surely do not
+        match are never scanned.
+
+        Args:
+            table: The DutSignalTable of the DUT.
+
+        Returns:
+            A list of signals, in the order of the table.
+        """
+
+        return list(table.signals)
+
     @staticmethod
     def get_matching_signal_list(bundle, signal_name: str) -> SignalList:
         """
@@ -211,6 +616,9 @@ class PrefixBindMethod(BindMethod):
     def __init__(self, prefix):
         super().__init__("prefix", prefix)
 
+    def select(self, table):
+        return table.with_prefix(self.method_value)
+
     def bind(self, bundle, all_signals, level_string, detection_mode):
         connected_signals = []  # Matched and connected signals
         matching_signals = []  # Matched but not connected signals,
@@ -218,11 +626,12 @@ class PrefixBindMethod(BindMethod):
         remain_signals = []  # Not matched signals
 
         prefix = self.method_value
+        current_level_signals = set(bundle.current_level_signals)
         for signal in all_signals:
             if signal["name"].startswith(prefix):
                 name_no_prefix = signal["name"][len(prefix) :]
 
-                if name_no_prefix in bundle.current_level_signals:
+                if name_no_prefix in current_level_signals:
                     if not detection_mode:
                         bundle._Bundle__add_signal_attr(
                             name_no_prefix,
@@ -268,6 +677,7 @@ class RegexBindMethod(BindMethod):
 
     def __init__(self, regex):
         super().__init__("regex", regex)
+        self.pattern = re.compile(regex)
 
     def bind(self, bundle, all_signals, level_string, detection_mode):
         connected_signals = []  # Matched and connected signals
@@ -275,13 +685,14 @@ class RegexBindMethod(BindMethod):
         # item's name in the list is the name in the captured group
         remain_signals = []  # Not matched signals
 
-        regex = self.method_value
+        search = self.pattern.search
+        current_level_signals = set(bundle.current_level_signals)
         for signal in all_signals:
-            match = re.search(regex, signal["name"])
+            match = search(signal["name"])
             if match is not None:
                 groups = ["" if x is None else x for x in match.groups()]
                 name = "".join(groups)
-                if name in bundle.current_level_signals:
+                if name in current_level_signals:
                     if not detection_mode:
                         bundle._Bundle__add_signal_attr(
                             name,
@@ -328,18 +739,26 @@ class DictBindMethod(BindMethod):
     def __init__(self, dict):
         super().__init__("dict", dict)
 
+    def select(self, table):
+        return table.with_names(self.method_value.values())
+
     def bind(self, bundle, all_signals, level_string, detection_mode):
         connected_signals = []  # Matched and connected signals
         matching_signals = []  # Matched but not connected signals,
         # item's name in the list is the name without prefix
         remain_signals = []  # Not matched signals
 
-        dict = self.method_value
+        # Map each DUT signal name to the first bundle signal name of it
+        bundle_names = {}
+        for key, value in self.method_value.items():
+            bundle_names.setdefault(value, key)
+
+        current_level_signals = set(bundle.current_level_signals)
         for signal in all_signals:
-            if signal["name"] in dict.values():
-                name = list(dict.keys())[list(dict.values()).index(signal["name"])]
+            if signal["name"] in bundle_names:
+                name = bundle_names[signal["name"]]
 
-                if name in bundle.current_level_signals:
+                if name in current_level_signals:
                     if not detection_mode:
                         bundle._Bundle__add_signal_attr(
                             name,
@@ -385,6 +804,10 @@ class Bundle(MObject):
 
     signals = []
 
+    # Increased whenever any bundle is bound or changes its structure. A bundle caches the signals of its
+    # sub-bundles as well, so the caches of all bundles are dropped when it changes.
+    __bind_version = 0
+
     def __init__(self):
         """
         Create a bundle.
@@ -399,10 +822,11 @@ class Bundle(MObject):
 
         self.__clock_event = None
         self.__connect_method = PrefixBindMethod("")
-        self.__dut_requests__ = Queue()
+        self.__dut_requests__ = collections.deque()
         self.__dut_instance__ = None
         self.__blocked_request__ = None
 
+        self.__layout = None
         self.__set_current_level_signal()
 
         # Recreate subbundles and signal lists for each instance
@@ -422,6 +846,57 @@ class Bundle(MObject):
             new_bundle_list = BundleList.from_bundlelist(bundle_list)
             setattr(self, bundle_list_name, new_bundle_list)
 
+    def __setattr__(self, name, value):
+        # Setting a sub-bundle, a signal list or a bundle list changes the structure of the bundle
+        layout = self.__dict__.get("_Bundle__layout")
+        if isinstance(value, (Bundle, SignalList, BundleList)) or (
+            layout is not None and name in layout.names
+        ):
+            self.__clear_layout()
+
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        layout = self.__dict__.get("_Bundle__layout")
+        if layout is not None and name in layout.names:
+            self.__clear_layout()
+
+        super().__delattr__(name)
+
+    def __clear_layout(self):
+        """
+        Drop the layout of the bundle, together with the caches of the bound signals of all bundles.
+        """
+
+        self.__dict__["_Bundle__layout"] = None
+        Bundle.__bind_version += 1
+
+    def __get_layout(self):
+        """
+        Get the layout of the bundle. The layout is computed once and kept until the structure of the bundle changes.
+        """
+
+        layout = self.__dict__.get("_Bundle__layout")
+        if layout is None:
+            layout = BundleLayout(self)
+            self.__dict__["_Bundle__layout"] = layout
+        return layout
+
+    def __get_bound_layout(self):
+        """
+        Get the layout of the bundle with its caches of the bound signals, which are dropped if any bundle has been
+        bound or changed its structure since they were filled.
+        """
+
+        layout = self.__get_layout()
+        if layout.bind_version != Bundle.__bind_version:
+            layout.bind_version = Bundle.__bind_version
+            layout.snapshot_reader = None
+            layout.writable_signals = None
+            layout.writable_widths = None
+            layout.dict_reader = None
+        return layout
+
     def ___dut_call_on_rise__(self, cycle):
         """
         Call the on rise method of target DUT.
@@ -429,66 +904,171 @@ class Bundle(MObject):
         Args:
             cycle: The cycle of the rise.
         """
-        request = None
-        if self.__blocked_request__ is not None:
-            if self.__blocked_request__["__condition_func__"](
-                cycle, self, self.__blocked_request__.get("__condition_args__", None)
-            ):
-                request = self.__blocked_request__
-                request.pop("__condition_func__", None)
-                request.pop("__condition_args__", None)
-                self.__blocked_request__ = None
-            else:
+
+        request = self.__blocked_request__
+        if request is not None:
+            if not request.condition_func(cycle, self, request.condition_args):
                 return
-        if request is None:
-            if self.__dut_requests__.empty():
+            self.__blocked_request__ = None
+        else:
+            if not self.__dut_requests__:
                 return
-            request = self.__dut_requests__.get()
-            if request is None:
+            request = self.__dut_requests__[0]
+            if isinstance(request, BundleBatchRequest):
+                if request.run_cycle():
+                    self.__dut_requests__.popleft()
                 return
-        if callable(request):
-            data = request(cycle, self)
-            if data is None:
+            self.__dut_requests__.popleft()
+            if request is None:
                 return
-            request = data
-        # check condition
-        if "__condition_func__" in request:
-            if not request["__condition_func__"](
-                cycle, self, request.get("__condition_args__", None)
+            if callable(request):
+                data = request(cycle, self)
+                if data is None:
+                    return
+                request = self.__parse_request(data, {})
+            # check condition
+            if request.condition_func is not None and not request.condition_func(
+                cycle, self, request.condition_args
             ):
                 self.__blocked_request__ = request
                 return
-        request.pop("__condition_func__", None)
-        request.pop("__condition_args__", None)
-        # callbacks
-        funcs = request.pop("__funcs__", None)
-        return_bundles = request.pop("__return_bundles__", None)
-        funcreturns = []
-        if not isinstance(funcs, list):
-            funcs = [funcs]
-        self.assign(request)
-        for func in funcs:
-            if callable(func):
-                funcreturns.append(func(cycle, self))
-            else:
-                funcreturns.append(None)
-        if len(funcreturns) == 1:
-            funcreturns = funcreturns[0]
-        # return bundle
-        if return_bundles is None:
-            return
-        if not isinstance(return_bundles, list):
-            return_bundles = [return_bundles]
-        ret_data = []
-        for return_bundle in return_bundles:
-            if isinstance(return_bundle, Bundle):
-                ret_data.append(return_bundle.as_dict())
-        if len(ret_data) == 1:
-            ret_data = ret_data[0]
-        # save return data in request
-        request["__funcs_return__"] = funcreturns
-        request["__return_values__"] = ret_data
-        request["__return_cycles__"] = cycle
+
+        request.run(cycle, self)
+
+    def __parse_request(self, request, plans):
+        """
+        Parse a request dictionary into a BundleRequest.
+
+        Args:
+            request: The request dictionary.
+            plans: A dictionary caching the write plans by the keys of the request and the readers by the return
+                   bundle, shared by the requests of one process_requests call.
+
+        Returns:
+            The parsed request.
+        """
+
+        parsed = BundleRequest(request)
+        parsed.condition_func = request.get("__condition_func__", None)
+        parsed.condition_args = request.get("__condition_args__", None)
+
+        funcs = request.get("__funcs__", None)
+        parsed.funcs = tuple(funcs) if isinstance(funcs, list) else (funcs,)
+
+        return_bundles = request.get("__return_bundles__", None)
+        if isinstance(return_bundles, Bundle):
+            readers = plans.get(return_bundles)
+            if readers is None:
+                readers = [return_bundles.__get_dict_reader()]
+                plans[return_bundles] = readers
+            parsed.return_readers = readers
+        elif return_bundles is not None:
+            if not isinstance(return_bundles, list):
+                return_bundles = [return_bundles]
+            parsed.return_readers = [
+                return_bundle.__get_dict_reader()
+                for return_bundle in return_bundles
+                if isinstance(return_bundle, Bundle)
+            ]
+
+        keys = tuple(request)
+        plan = plans.get(keys)
+        if plan is None:
+            plan = self.__compile_request_plan(keys)
+            plans[keys] = plan
+        parsed.targets, value_keys = plan
+        parsed.values = [request[key] for key in value_keys]
+
+        return parsed
+
+    def __compile_request_plan(self, keys):
+        """
+        Resolve the keys of a request dictionary to write targets, in the same way as assign. "*" is written first.
+
+        Args:
+            keys: The keys of the request dictionary.
+
+        Returns:
+            A tuple of the write targets and the keys of their values.
+        """
+
+        targets, value_keys = [], []
+        if "*" in keys:
+            targets.append((BundleRequest.SET_ALL, self))
+            value_keys.append("*")
+        for key in keys:
+            if key == "*" or key in Bundle.__request_keys:
+                continue
+            target = self.__resolve_request_target(key)
+            if target is not None:
+                targets.append(target)
+                value_keys.append(key)
+        return tuple(targets), tuple(value_keys)
+
+    def __resolve_request_target(self, signal):
+        """
+        Resolve a key of a request dictionary to a write target, in the same way as assign.
+
+        Returns:
+            A tuple of the kind of the write and its target, or None if the signal is not found.
+        """
+
+        layout = self.__get_layout()
+        if signal in self.current_level_signals:
+            return (BundleRequest.WRITE_SIGNAL, getattr(self, signal))
+        elif signal in layout.signal_list_set or signal in layout.bundle_list_set:
+            return (BundleRequest.ASSIGN, getattr(self, signal).assign)
+        elif signal in layout.sub_bundle_set:
+            sub_bundle = getattr(self, signal)
+            return (
+                BundleRequest.ASSIGN,
+                lambda value: sub_bundle.assign(value, True, signal),
+            )
+
+        error(f'assign: signal "{signal}" is not found in bundle')
+        return None
+
+    def __get_dict_reader(self):
+        """
+        Get a function that returns the same dictionary as as_dict(). The signals are resolved once and kept until
+        any bundle is bound or changes its structure.
+        """
+
+        layout = self.__get_bound_layout()
+        if layout.dict_reader is None:
+            layout.dict_reader = self.__compile_dict_reader()
+        return layout.dict_reader
+
+    def __compile_dict_reader(self):
+        """
+        Compile a function that returns the same dictionary as as_dict().
+        """
+
+        signals = [(name, getattr(self, name)) for name in self.current_level_signals]
+        signal_lists = [
+            (name, signal_list.signals)
+            for name, signal_list in self.__all_signal_lists()
+        ]
+        sub_bundles = [
+            (name, sub_bundle.__get_dict_reader())
+            for name, sub_bundle in self.__all_sub_bundles()
+        ]
+        bundle_lists = [
+            (name, [bundle.__get_dict_reader() for bundle in bundle_list.bundles])
+            for name, bundle_list in self.__all_bundle_lists()
+        ]
+
+        def read():
+            values = {name: signal.value for name, signal in signals}
+            for name, list_signals in signal_lists:
+                values[name] = [signal.value for signal in list_signals]
+            for name, reader in sub_bundles:
+                values[name] = reader()
+            for name, readers in bundle_lists:
+                values[name] = [reader() for reader in readers]
+            return values
+
+        return read
 
     def make_requset_response_for(self, dut):
         """
@@ -502,6 +1082,13 @@ class Bundle(MObject):
         dut.StepRis(self.___dut_call_on_rise__)
         self.__dut_instance__ = dut
 
+    __request_keys = (
+        "__condition_func__",
+        "__condition_args__",
+        "__funcs__",
+        "__return_bundles__",
+    )
+
     def process_requests(self, request: Optional[Union[Dict, List[Dict]]]):
         """
         Process the requests.
@@ -509,37 +1096,97 @@ class Bundle(MObject):
         Args:
             request: The request to process.
         """
-        for key in [
-            "__condition_func__",
-            "__condition_args__",
-            "__funcs__",
-            "__return_bundles__",
-        ]:
+        for key in Bundle.__request_keys:
             if hasattr(self, key):
                 error(f"bundule can not with name: {key}")
-        assert self.__dut_requests__.empty(), "The request queue is not empty"
+        assert not self.__dut_requests__, "The request queue is not empty"
         if self.__dut_instance__ is None:
             error(
                 "The dut instance is not set, need to call make_requset_response_for first"
             )
         if not isinstance(request, list):
             request = [request]
-        for req in request:
-            self.__dut_requests__.put(req)
-        while not self.__dut_requests__.empty():
+
+        plans = {}
+        parsed_requests = [
+            self.__parse_request(req, plans) if isinstance(req, dict) else req
+            for req in request
+        ]
+        self.__dut_requests__.extend(parsed_requests)
+        while self.__dut_requests__ or self.__blocked_request__ is not None:
             self.__dut_instance__.Step(1)
+
         ret = []
-        for req in request:
-            if isinstance(req, dict) and "__return_values__" in req:
+        for req in parsed_requests:
+            if isinstance(req, BundleRequest) and req.return_cycle is not None:
+                # Keep the results in the request dictionary as well
+                req.source["__funcs_return__"] = req.funcs_return
+                req.source["__return_values__"] = req.return_values
+                req.source["__return_cycles__"] = req.return_cycle
                 ret.append(
                     {
-                        "data": req["__return_values__"],
-                        "cycle": req["__return_cycles__"],
+                        "data": req.return_values,
+                        "cycle": req.return_cycle,
+                        "__funcs_return__": req.funcs_return,
                     }
                 )
-                ret[-1]["__funcs_return__"] = req["__funcs_return__"]
         return ret
 
+    def process_columns(self, inputs, outputs=None, ncycles=None):
+        """
+        Process a batch of requests given as columns. On the i-th rising edge, the i-th value of each input column is
+        written to its signal, and then the output signals are sampled, at the same point where process_requests reads
+        the return bundles. The DUT is stepped by all cycles in one call.
+
+        >>> outputs = bundle.process_columns({"a": a_values, "b": b_values}, ["sum"])
+        >>> outputs["sum"][0]
+
+        Args:
+            inputs: A dictionary mapping signal names as yielded by all_signals, such as "a" or "sub.a", to sequences
+                    of values of the same length, such as lists, array.array or numpy arrays.
+            outputs: A list of signal names to sample. If it is None, all signals are sampled.
+            ncycles: The number of cycles to process. It is only needed when there are no input columns.
+
+        Returns:
+            A dictionary mapping each output signal name to the column of its sampled values. A column is an
+            array.array("Q") if all values fit in it, otherwise a list.
+        """
+
+        assert not self.__dut_requests__, "The request queue is not empty"
+        if self.__dut_instance__ is None:
+            error(
+                "The dut instance is not set, need to call make_requset_response_for first"
+            )
+
+        lengths = {len(column) for column in inputs.values()}
+        assert len(lengths) <= 1, "input columns must have the same length"
+        if lengths:
+            (length,) = lengths
+            assert ncycles is None or ncycles == length, "ncycles must match columns"
+            ncycles = length
+        assert ncycles is not None, "ncycles must be given when there are no inputs"
+
+        writer = self.compile_writer(list(inputs.keys()))
+        reader = self.compile_reader(outputs)
+        if ncycles == 0:
+            return {key: array.array("Q") for key in reader.keys}
+
+        batch = BundleBatchRequest(
+            writer.signals, list(inputs.values()), reader.signals, ncycles
+        )
+        self.__dut_requests__.append(batch)
+        self.__dut_instance__.Step(ncycles)
+        assert not self.__dut_requests__, "the batch is not finished"
+
+        columns = {}
+        for key, column in zip(reader.keys, batch.return_columns):
+            try:
+                columns[key] = array.array("Q", column)
+            except (OverflowError, TypeError):
+                # Values wider than 64 bits or not integers
+                columns[key] = column
+        return columns
+
     def set_name(self, name):
         """
         Set the name of the bundle.
@@ -675,8 +1322,7 @@ class Bundle(MObject):
         if self.__clock_event is None:
             critical("cannot use step in bundle without a connected signal")
 
-        for _ in range(ncycles):
-            await self.__clock_event.wait()
+        await wait_cycles(self.__clock_event, ncycles)
 
     def bind(self, dut, unconnected_signal_access=True):
         """
@@ -690,6 +1336,8 @@ class Bundle(MObject):
             The bundle itself.
         """
 
+        self.__clear_layout()
+
         if self.bound:
             warning("bundle is already bound, the previous bind will be overwritten")
             self.__unbind_all()
@@ -698,15 +1346,39 @@ class Bundle(MObject):
             for sub_bundle_name, sub_bundle in self.__all_sub_bundles():
                 sub_bundle.set_name(sub_bundle_name)
 
-        self.__bind_from_signal_list(
-            list(self.dut_all_signals(dut)),
-            self.name,
-            [],
-            unconnected_signal_access,
-            False,
-            None,
-            None,
-        )
+        table = DutSignalTable.of(dut)
+        cache_key = None
+        mapping = None
+        if get_bind_cache_dir() is not None:
+            cache_key = bind_cache_key(table.digest(), (self.name, self.__rule_tree()))
+            mapping = load_bind_mapping(cache_key)
+            if mapping is not None and not all(
+                dut_signal_name in table.by_name for dut_signal_name in mapping.values()
+            ):
+                mapping = None
+
+        if mapping is not None:
+            self.__bind_from_mapping(
+                table, mapping, self.name, [], unconnected_signal_access
+            )
+        else:
+            # Signals that are not matched at the top level are dropped, so only the
+            # signals the connect method could match are passed down
+            self.__bind_from_signal_list(
+                self.__connect_method.select(table),
+                self.name,
+                [],
+                unconnected_signal_access,
+                False,
+                None,
+                None,
+            )
+
+            if cache_key is not None:
+                try:
+                    store_bind_mapping(cache_key, self.__resolved_mapping(table))
+                except OSError as e:
+                    warning(f"failed to store the bind cache: {e}")
 
         self.bound = True
         if self.write_mode is not None:
@@ -768,9 +1440,116 @@ class Bundle(MObject):
                         signals[f"{bundle_list_name}[{i}].{bundle_signal}"] = value
             return signals
 
+    def __resolve_signals(self, keys):
+        """
+        Resolve signal names to the signals in the bundle.
+
+        Args:
+            keys: A list of signal names as yielded by all_signals, such as "a", "sub.a", "vec[0]" or "list[1].a".
+                  If it is None, all signals are resolved.
+
+        Returns:
+            A tuple of the list of names and the list of signals.
+        """
+
+        all_signals = dict(self.all_signals())
+        if keys is None:
+            return list(all_signals.keys()), list(all_signals.values())
+
+        for key in keys:
+            assert key in all_signals, f'signal "{key}" is not found in bundle'
+        return list(keys), [all_signals[key] for key in keys]
+
+    def compile_reader(self, keys=None):
+        """
+        Compile a reader for the signals. The reader resolves the signals once, and then reads their values in one
+        pass each time it is called, which is much faster than as_dict. It should be compiled again after the bundle
+        is rebound.
+
+        >>> reader = bundle.compile_reader(["a", "sub.b"])
+        >>> a, sub_b = reader()
+
+        Args:
+            keys: A list of signal names as yielded by all_signals, such as "a", "sub.a", "vec[0]" or "list[1].a".
+                  If it is None, all signals are read.
+
+        Returns:
+            A BundleReader.
+        """
+
+        return BundleReader(*self.__resolve_signals(keys))
+
+    def compile_writer(self, keys=None):
+        """
+        Compile a writer for the signals. The writer resolves the signals once, and then writes their values in one
+        pass each time it is called, which is much faster than assign. It should be compiled again after the bundle
+        is rebound.
+
+        >>> writer = bundle.compile_writer(["a", "sub.b"])
+        >>> writer((1, 2))
+
+        Args:
+            keys: A list of signal names as yielded by all_signals, such as "a", "sub.a", "vec[0]" or "list[1].a".
+                  If it is None, all signals are written.
+
+        Returns:
+            A BundleWriter.
+        """
+
+        return BundleWriter(*self.__resolve_signals(keys))
+
+    def snapshot(self):
+        """
+        Take a snapshot of all signals values in the bundle. The snapshot keeps the values in a flat array in the
+        order of all_signals, which is much more compact than as_dict, and two snapshots can be compared with diff.
+
+        >>> prev = bundle.snapshot()
+        >>> await bundle.step()
+        >>> changes = bundle.snapshot().diff(prev)
+
+        Returns:
+            A BundleSnapshot.
+        """
+
+        layout = self.__get_bound_layout()
+        if layout.snapshot_reader is None:
+            layout.snapshot_reader = self.compile_reader()
+        return layout.snapshot_reader.snapshot()
+
+    def __writable_signals(self):
+        """
+        Get the names and the signals of all writable xpins in the bundle, including sub-bundles. They are collected
+        once and kept until any bundle is bound or changes its structure.
+
+        Returns:
+            A tuple of the list of names and the list of signals.
+        """
+
+        layout = self.__get_bound_layout()
+        if layout.writable_signals is None:
+            names, signals = [], []
+            for signal_name, signal in self.all_signals():
+                if Bundle.__is_instance_of_xpin(signal) and not signal.IsOutIO():
+                    names.append(signal_name)
+                    signals.append(signal)
+            layout.writable_signals = (names, signals)
+        return layout.writable_signals
+
+    def __writable_widths(self):
+        """
+        Get the widths of the writable xpins, in the order of __writable_signals. A width of 0 is taken as 1.
+        """
+
+        layout = self.__get_bound_layout()
+        if layout.writable_widths is None:
+            _, signals = self.__writable_signals()
+            layout.writable_widths = [signal.W() or 1 for signal in signals]
+        return layout.writable_widths
+
     def set_all(self, value):
         """
-        Set all signals values to a value, including sub-bundles.
+        Set all signals values to a value, including sub-bundles. When the write mode of the bundle is immediate,
+        signals that already hold the value are not written.
 
         Args:
             value: The value to set.
@@ -779,8 +1558,14 @@ class Bundle(MObject):
             The bundle itself.
         """
 
-        for _, signal in self.all_signals():
-            if Bundle.__is_instance_of_xpin(signal) and not signal.IsOutIO():
+        _, signals = self.__writable_signals()
+        if self.write_mode == WriteMode.Imme:
+            for signal in signals:
+                if signal.value != value:
+                    signal.value = value
+        else:
+            # A pending write may differ from the current value, so always write
+            for signal in signals:
                 signal.value = value
         return self
 
@@ -794,22 +1579,35 @@ class Bundle(MObject):
             value_range: The range of the random values, eg. (0, 100), both values are inclusive. If None, the range
                          of random values will be the range of each signal value.
             exclude_signals: A list of signals to exclude from randomization, sub-bundle names are separated by dots.
-            random_func: The random function to use, default is random.randint.
+            random_func: The random function to use, default is random.randint. It is called with the lower and upper
+                         bounds of each value. If it is random.getrandbits, it is called with the width of each
+                         signal instead, which is faster but draws different values from random.randint for the
+                         same seed. It can not be used with value_range.
         """
 
-        for signal_name, signal in self.all_signals():
-            if (
-                signal_name not in exclude_signals
-                and Bundle.__is_instance_of_xpin(signal)
-                and not signal.IsOutIO()
-            ):
-                if value_range is not None:
-                    signal.value = random_func(value_range[0], value_range[1])
-                else:
-                    signal_width = signal.W()
-                    if signal_width == 0:
-                        signal_width = 1
-                    signal.value = random_func(0, 2**signal_width - 1)
+        names, signals = self.__writable_signals()
+        widths = self.__writable_widths() if value_range is None else None
+
+        if exclude_signals:
+            exclude_signals = set(exclude_signals)
+            included = [
+                i for i, name in enumerate(names) if name not in exclude_signals
+            ]
+            signals = [signals[i] for i in included]
+            widths = [widths[i] for i in included] if widths is not None else None
+
+        if value_range is not None:
+            assert (
+                random_func is not random.getrandbits
+            ), "random.getrandbits can not be used with value_range"
+            values = [random_func(value_range[0], value_range[1]) for _ in signals]
+        elif random_func is random.getrandbits:
+            values = list(map(random.getrandbits, widths))
+        else:
+            values = [random_func(0, (1 << width) - 1) for width in widths]
+
+        for signal, value in zip(signals, values):
+            signal.value = value
 
     def assign(self, item, multilevel=True, level_string=""):
         """
@@ -843,27 +1641,21 @@ class Bundle(MObject):
             self.set_all(item["*"])
             del item["*"]
 
+        layout = self.__get_layout()
+
         if multilevel:
             for signal, value in item.items():
                 if signal in self.current_level_signals:
                     getattr(self, signal).value = value
-                elif any(
-                    signal_list[0] == signal
-                    for signal_list in self.__all_signal_lists()
-                ):
+                elif signal in layout.signal_list_set:
                     getattr(self, signal).assign(value)
-                elif any(
-                    subbundle[0] == signal for subbundle in self.__all_sub_bundles()
-                ):
+                elif signal in layout.sub_bundle_set:
                     getattr(self, signal).assign(
                         value,
                         multilevel,
                         Bundle.__appended_level_string(level_string, signal),
                     )
-                elif any(
-                    bundle_list[0] == signal
-                    for bundle_list in self.__all_bundle_lists()
-                ):
+                elif signal in layout.bundle_list_set:
                     getattr(self, signal).assign(value, multilevel)
                 else:
                     full_signal_name = Bundle.__appended_level_string(
@@ -874,19 +1666,14 @@ class Bundle(MObject):
             for signal, value in item.items():
                 if signal in self.current_level_signals:
                     getattr(self, signal).value = value
-                elif any(
-                    signal_list[0] == signal
-                    for signal_list in self.__all_signal_lists()
-                ):
+                elif signal in layout.signal_list_set:
                     getattr(self, signal).assign(value)
                 else:
                     sub_bundle_name = None
                     if "." in signal:
                         sub_bundle_name, sub_bundle_signal = signal.split(".", 1)
 
-                    if sub_bundle_name in [
-                        sub_bundle[0] for sub_bundle in self.__all_sub_bundles()
-                    ]:
+                    if sub_bundle_name in layout.sub_bundle_set:
                         getattr(self, sub_bundle_name).assign(
                             {sub_bundle_signal: value},
                             multilevel,
@@ -894,10 +1681,7 @@ class Bundle(MObject):
                                 level_string, sub_bundle_name
                             ),
                         )
-                    elif any(
-                        bundle_list[0] == signal
-                        for bundle_list in self.__all_bundle_lists()
-                    ):
+                    elif signal in layout.bundle_list_set:
                         getattr(self, signal).assign(value, multilevel)
                     else:
                         full_signal_name = Bundle.__appended_level_string(
@@ -1077,10 +1861,7 @@ class Bundle(MObject):
         """
 
         self.current_level_signals = [signal for signal in self.signals]
-
-        for signal in dir(self):
-            if isinstance(getattr(self, signal), Signal):
-                self.current_level_signals.append(signal)
+        self.current_level_signals.extend(self.__get_layout().signals)
 
     def all_signals(self, level_string=""):
         """
@@ -1202,9 +1983,8 @@ class Bundle(MObject):
             sub-bundle and sub_bundle is the sub-bundle itself.
         """
 
-        for attr in dir(self):
-            if isinstance(getattr(self, attr), Bundle):
-                yield (attr, getattr(self, attr))
+        for attr in self.__get_layout().sub_bundles:
+            yield (attr, getattr(self, attr))
 
     def __all_signal_lists(self):
         """
@@ -1215,9 +1995,8 @@ class Bundle(MObject):
             signal list and signal_list is the signal list itself.
         """
 
-        for attr in dir(self):
-            if isinstance(getattr(self, attr), SignalList):
-                yield (attr, getattr(self, attr))
+        for attr in self.__get_layout().signal_lists:
+            yield (attr, getattr(self, attr))
 
     def __all_bundle_lists(self):
         """
@@ -1228,9 +2007,8 @@ class Bundle(MObject):
             bundle list and bundle_list is the bundle list itself.
         """
 
-        for attr in dir(self):
-            if isinstance(getattr(self, attr), BundleList):
-                yield (attr, getattr(self, attr))
+        for attr in self.__get_layout().bundle_lists:
+            yield (attr, getattr(self, attr))
 
     def __detect_missing_signals(
         self, connected_signals, level_string, rule_stack, unconnected_signal_access
@@ -1247,6 +2025,7 @@ class Bundle(MObject):
         """
 
         self._dummy_signal = DummySignal()
+        connected_signals = set(connected_signals)
 
         for signal in self.current_level_signals:
             if signal not in connected_signals:
@@ -1329,6 +2108,10 @@ class Bundle(MObject):
             A list of signals that are not matched.
         """
 
+        if not detection_mode:
+            # The cached signals of every bundle in the tree are replaced
+            self.__clear_layout()
+
         rule_stack = rule_stack + [self]
         connected_signals, matching_signals, remain_signals = (
             self.__connect_method.bind(self, all_signals, level_string, detection_mode)
@@ -1343,16 +2126,17 @@ class Bundle(MObject):
                 error("specific signal could only be used in detection mode")
         else:
             if specific_signal is not None:
-                remain_signals += connected_signals
-                connected_signals = []
+                candidates = remain_signals + connected_signals
+                connected_signals, remain_signals = [], []
 
-                for signal in remain_signals:
+                for signal in candidates:
                     full_signal_name = Bundle.__appended_level_string(
                         level_string, signal["name"]
                     )
                     if full_signal_name == specific_signal:
                         connected_signals.append(signal)
-                        remain_signals.remove(signal)
+                    else:
+                        remain_signals.append(signal)
 
             if all_signals_rule is not None:
                 for signal in self.current_level_signals:
@@ -1401,6 +2185,124 @@ class Bundle(MObject):
         Bundle.__revert_signal_name(matching_signals, all_signals)
         return matching_signals + remain_signals
 
+    def __rule_tree(self):
+        """
+        Describe the structure of the bundle and the rules used to connect it, as a nested tuple.
+        """
+
+        return (
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.__connect_method.method,
+            repr(self.__connect_method.method_value),
+            tuple(self.current_level_signals),
+            tuple(
+                (signal_list_name, tuple(signal_list.names))
+                for signal_list_name, signal_list in self.__all_signal_lists()
+            ),
+            tuple(
+                (sub_bundle_name, sub_bundle.__rule_tree())
+                for sub_bundle_name, sub_bundle in self.__all_sub_bundles()
+            ),
+            tuple(
+                (bundle_list_name, tuple(b.__rule_tree() for b in bundle_list.bundles))
+                for bundle_list_name, bundle_list in self.__all_bundle_lists()
+            ),
+        )
+
+    def __resolved_mapping(self, table):
+        """
+        Get the mapping of the bound signals.
+
+        Args:
+            table: The DutSignalTable of the DUT the bundle is bound to.
+
+        Returns:
+            A dictionary mapping signal names in the bundle, as yielded by all_signals, to signal names in the DUT.
+        """
+
+        dut_signal_names = table.names_by_id()
+        return {
+            signal_name: dut_signal_names[id(signal)]
+            for signal_name, signal in self.all_signals(self.name)
+            if id(signal) in dut_signal_names
+        }
+
+    def __bind_from_mapping(
+        self, table, mapping, level_string, rule_stack, unconnected_signal_access
+    ):
+        """
+        Bind the signals to the bundle from a mapping resolved by an earlier bind.
+
+        Args:
+            table: The DutSignalTable of the DUT.
+            mapping: A dictionary mapping signal names in the bundle, as yielded by all_signals, to signal names in
+                     the DUT.
+            level_string: The string of the current level.
+            rule_stack: The stack of rules to bind the signals, this is a list of bundles.
+            unconnected_signal_access: Whether unconnected signals could be accessed.
+        """
+
+        self.__clear_layout()
+        rule_stack = rule_stack + [self]
+        connected_signals = []
+
+        for signal_name in self.current_level_signals:
+            full_signal_name = Bundle.__appended_level_string(level_string, signal_name)
+            if full_signal_name in mapping:
+                dut_signal_name = mapping[full_signal_name]
+                self.__add_signal_attr(
+                    signal_name,
+                    table.by_name[dut_signal_name]["signal"],
+                    info_bundle_name=full_signal_name,
+                    info_dut_name=dut_signal_name,
+                )
+                connected_signals.append(signal_name)
+
+        for signal_list_name, signal_list in self.__all_signal_lists():
+            for idx, signal_name in enumerate(signal_list.names):
+                full_signal_name = Bundle.__appended_level_string(
+                    level_string, f"{signal_list_name}[{idx}]"
+                )
+                if full_signal_name in mapping:
+                    dut_signal_name = mapping[full_signal_name]
+                    signal_list.bind_signal(
+                        self,
+                        signal_name,
+                        table.by_name[dut_signal_name]["signal"],
+                        info_bundle_name=Bundle.__appended_level_string(
+                            level_string, signal_list_name
+                        ),
+                        info_dut_name=dut_signal_name,
+                    )
+                    connected_signals.append(signal_name)
+
+        self.__detect_missing_signals(
+            connected_signals, level_string, rule_stack, unconnected_signal_access
+        )
+
+        for sub_bundle_name, sub_bundle in self.__all_sub_bundles():
+            sub_bundle.__bind_from_mapping(
+                table,
+                mapping,
+                Bundle.__appended_level_string(level_string, sub_bundle_name),
+                rule_stack,
+                unconnected_signal_access,
+            )
+            if sub_bundle.__clock_event is not None:
+                self.__clock_event = sub_bundle.__clock_event
+
+        for bundle_list_name, bundle_list in self.__all_bundle_lists():
+            for idx, bundle in enumerate(bundle_list.bundles):
+                bundle.__bind_from_mapping(
+                    table,
+                    mapping,
+                    Bundle.__appended_level_string(
+                        level_string, f"{bundle_list_name}[{idx}]"
+                    ),
+                    rule_stack,
+                    unconnected_signal_access,
+                )
+
     def __check_dict_value(self, dict):
         """
         Check if the values of the dictionary are valid.
@@ -1440,7 +2342,7 @@ class Bundle(MObject):
         """
 
         unconnected_signals = []
-        for signal_info in Bundle.dut_all_signals(dut):
+        for signal_info in DutSignalTable.of(dut).signals:
             signal = signal_info["signal"]
             if (
                 not hasattr(signal, "number_of_bundles_connected_to")
@@ -1463,7 +2365,7 @@ class Bundle(MObject):
         """
 
         multiple_connections = []
-        for signal_info in Bundle.dut_all_signals(dut):
+        for signal_info in DutSignalTable.of(dut).signals:
             signal = signal_info["signal"]
             if (
                 hasattr(signal, "number_of_bundles_connected_to")
@@ -1503,10 +2405,13 @@ class Bundle(MObject):
             last_signal_list: The structure of the last signal list is the same as the signal_list.
         """
 
+        last_names = {
+            last_signal["org_name"]: last_signal["name"]
+            for last_signal in last_signal_list
+        }
         for signal in signal_list:
-            for last_signal in last_signal_list:
-                if signal["org_name"] == last_signal["org_name"]:
-                    signal["name"] = last_signal["name"]
+            if signal["org_name"] in last_names:
+                signal["name"] = last_names[signal["org_name"]]
 
     @staticmethod
     def __is_instance_of_xpin(signal):
@@ -1531,7 +2436,7 @@ class Bundle(MObject):
     @staticmethod
     def dut_all_signals(dut):
         """
-        Yield all signals of the dut.
+        Yield all signals of the dut. The signals are enumerated once for each dut and kept in its DutSignalTable.
 
         Args:
             dut: The dut to get signals from.
@@ -1540,10 +2445,8 @@ class Bundle(MObject):
             A generator of dictionaries containing the name, original name, and signal of the signal.
         """
 
-        for attr in dir(dut):
-            signal = getattr(dut, attr)
-            if not callable(signal) and Bundle.__is_instance_of_xpin(signal):
-                yield {"name": attr, "org_name": attr, "signal": signal}
+        for signal in DutSignalTable.of(dut).signals:
+            yield dict(signal)
 
     @staticmethod
     def __get_rule_string(rule_stack, signal):
@@ -1,22 +1,179 @@
 __all__ = ["Delayer"]
 
 import asyncio
+
 from .asynchronous import add_callback
+from .asynchronous import add_cleanup
+from .asynchronous import add_step_limit
 from ._base import MObject
 
 
+class DelayLine:
+    """
+    The history of one signal, kept in a ring buffer. The buffer holds the last `depth + 1` samples, where depth is
+    the largest delay of the delayers reading the line.
+    """
+
+    __slots__ = ("signal", "buffer", "count", "valid", "readers")
+
+    def __init__(self, signal, depth):
+        self.signal = signal
+        self.buffer = [None] * (depth + 1)
+        self.count = 0  # The number of samples taken
+        self.valid = 0  # The number of samples kept in the buffer
+        self.readers = 0  # The number of delayers reading the line
+
+    @property
+    def depth(self):
+        return len(self.buffer) - 1
+
+    def extend(self, depth):
+        """
+        Make the line keep at least depth + 1 samples. The samples already kept are moved to the new buffer.
+        """
+
+        if depth <= self.depth:
+            return
+
+        old_buffer = self.buffer
+        self.buffer = [None] * (depth + 1)
+        for i in range(self.count - self.valid, self.count):
+            self.buffer[i % len(self.buffer)] = old_buffer[i % len(old_buffer)]
+
+    def sample(self):
+        """
+        Sample the signal value once.
+        """
+
+        buffer = self.buffer
+        buffer[self.count % len(buffer)] = self.signal.value
+        self.count += 1
+        if self.valid < len(buffer):
+            self.valid += 1
+
+    def value(self, delay):
+        """
+        Get the value the signal had delay samples ago, or None if it was not sampled then.
+        """
+
+        if delay >= self.valid:
+            return None
+        return self.buffer[(self.count - 1 - delay) % len(self.buffer)]
+
+
+class DelayLines:
+    """
+    The delay lines of an event loop, one for each delayed signal. Delayers of the same signal share one line, and all
+    lines are sampled in one pass after each cycle.
+    """
+
+    def __init__(self):
+        self.lines = {}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def add(self, signal, delay):
+        """
+        Get the line of a signal, creating it or extending it so that it keeps delay + 1 samples.
+
+        Args:
+            signal: The signal to delay.
+            delay: The delay of the delayer reading the line.
+
+        Returns:
+            The delay line of the signal.
+        """
+
+        line = self.lines.get(id(signal))
+        if line is None:
+            line = DelayLine(signal, delay)
+            self.lines[id(signal)] = line
+        else:
+            line.extend(delay)
+        line.readers += 1
+        return line
+
+    def remove(self, line):
+        """
+        Release a line got from add. The line is no longer sampled once all its readers are released.
+
+        Args:
+            line: The delay line to release.
+        """
+
+        line.readers -= 1
+        if line.readers <= 0 and self.lines.get(id(line.signal)) is line:
+            del self.lines[id(line.signal)]
+
+    def sample_all(self):
+        """
+        Sample all lines once.
+        """
+
+        for line in self.lines.values():
+            buffer = line.buffer
+            buffer[line.count % len(buffer)] = line.signal.value
+            line.count += 1
+            if line.valid < len(buffer):
+                line.valid += 1
+
+
+def get_delay_lines():
+    """
+    Get the delay lines of the current event loop.
+    """
+
+    loop = asyncio.get_event_loop()
+    if not hasattr(loop, "delay_lines"):
+        loop.delay_lines = DelayLines()
+    return loop.delay_lines
+
+
 async def __process_delayer():
-    for delayer in asyncio.get_event_loop().delayer_list:
-        delayer.sample()
+    delay_lines = getattr(asyncio.get_event_loop(), "delay_lines", None)
+    if delay_lines:
+        delay_lines.sample_all()
     return False
 
 
-add_callback(__process_delayer)
+def __delayer_step_limit():
+    """
+    Delayers sample their signals once per cycle, so the clock can not skip cycles while any delayer exists.
+    """
+
+    if getattr(asyncio.get_event_loop(), "delay_lines", None):
+        return 1
+    return None
+
+
+def __drop_delay_lines():
+    """
+    Drop the delay lines of the finished test, the delayers it created are no longer sampled.
+    """
+
+    loop = asyncio.get_event_loop()
+    if hasattr(loop, "delay_lines"):
+        del loop.delay_lines
+
+
+add_callback(__process_delayer, every_cycle=False)
+add_step_limit(__delayer_step_limit)
+add_cleanup(__drop_delay_lines)
 
 
 class Delayer(MObject):
     """
     A Delayer class is used to delay the signal value.
+
+    The history of the signal is kept in a ring buffer shared by all delayers of the same signal, so a delayer created
+    after another one of the same signal can read the history that is already kept.
+
+    A delayer stops sampling when it is closed or when the test that created it finishes. It can also be used as a context manager:
+
+    >>> with Delayer(dut.a, 2) as delayed_a:
+    ...     await ClockCycles(dut, 2)
+    ...     print(delayed_a.value)
     """
 
     def __init__(self, signal, delay):
@@ -26,22 +183,41 @@ class Delayer(MObject):
 
         self.signal = signal
         self.delay = delay
-        self.value_list = []
+        self.__delay_lines = get_delay_lines()
+        self.line = self.__delay_lines.add(signal, delay)
+        self.closed = False
+
+    def close(self):
+        """
+        Stop sampling the signal for the delayer. The values already sampled can still be read.
+        """
+
+        if not self.closed:
+            self.closed = True
+            self.__delay_lines.remove(self.line)
+
+    def __enter__(self):
+        return self
 
-        loop = asyncio.get_event_loop()
-        if not hasattr(loop, "delayer_list"):
-            loop.delayer_list = []
-        asyncio.get_event_loop().delayer_list.append(self)
+    def __exit__(self, *args):
+        self.close()
 
     def sample(self):
         """
-        Sample the signal value once and store it in the value list.
+        Sample the signal value once. The signals are sampled after each cycle automatically, it only needs to be
+        called when the signal is not driven by the clock.
         """
 
-        if len(self.value_list) >= self.delay + 1:
-            self.value_list.pop(0)
+        self.line.sample()
 
-        self.value_list.append(self.signal.value)
+    @property
+    def value_list(self):
+        """
+        The samples kept for the delayer, from the oldest to the newest.
+        """
+
+        kept = min(self.line.valid, self.delay + 1)
+        return [self.line.value(delay) for delay in range(kept - 1, -1, -1)]
 
     @property
     def value(self):
@@ -49,7 +225,4 @@ class Delayer(MObject):
         Get the value of the signal after the delay.
         """
 
-        if len(self.value_list) != self.delay + 1:
-            return None
-
-        return self.value_list[0]
+        return self.line.value(self.delay)
@@ -1,44 +1,129 @@
 __all__ = ["Executor"]
 
+import heapq
+from collections import deque
+
 from .asynchronous import add_callback
 from .asynchronous import create_task
 from .asynchronous import Event
 from .asynchronous import gather
 from ._base import MObject
 
-
 """
 Priority Task Execution
 """
 
-__priority_tasks = []
+
+class PriorityTaskQueue:
+    """
+    A queue of priority tasks. Tasks are kept in one FIFO bucket per priority and a heap records the priorities that
+    have pending tasks, so tasks are popped in priority order and tasks of the same priority keep their insertion
+    order.
+    """
+
+    def __init__(self):
+        self.__buckets = {}
+        self.__priorities = []
+        self.__size = 0
+
+    def push(self, task, priority):
+        """
+        Push a task into the queue.
+
+        Args:
+            task: The task to be pushed.
+            priority: The priority of the task. The smaller the number, the higher the priority.
+        """
+
+        bucket = self.__buckets.get(priority)
+        if bucket is None:
+            bucket = self.__buckets[priority] = deque()
+            heapq.heappush(self.__priorities, priority)
+        bucket.append(task)
+        self.__size += 1
+
+    def pop(self):
+        """
+        Pop the task with the highest priority.
+
+        Returns:
+            The earliest pushed task among the tasks with the highest priority.
+        """
+
+        priority = self.__priorities[0]
+        bucket = self.__buckets[priority]
+        task = bucket.popleft()
+        if not bucket:
+            del self.__buckets[priority]
+            heapq.heappop(self.__priorities)
+        self.__size -= 1
+        return task
+
+    def __len__(self):
+        return self.__size
+
+
+__priority_tasks = PriorityTaskQueue()
 
 
 def add_priority_task(coro, priority, done_event=None):
     """
-    Add a priority task to the priority task list.
+    Add a priority task to the priority task queue.
     """
 
-    __priority_tasks.append((coro, priority, done_event))
+    __priority_tasks.push((coro, done_event), priority)
 
 
 async def __execute_priority_tasks():
     """
-    Execute the priority tasks in the priority task list. It will be called every clock cycle.
+    Execute the priority tasks in the priority task queue. It will be called every clock cycle.
     """
 
     set_event = False
-    for coro, _, done_event in sorted(__priority_tasks, key=lambda x: x[1]):
+    while len(__priority_tasks) > 0:
+        coro, done_event = __priority_tasks.pop()
         await coro
         if done_event is not None:
             set_event = True
             done_event.set()
 
-    __priority_tasks.clear()
     return set_event
 
 
-add_callback(__execute_priority_tasks)
+add_callback(__execute_priority_tasks, every_cycle=False)
+
+"""
+Driver Coroutines
+"""
+
+# The code objects of the driver method wrappers. A coroutine created by a driver method runs one of them.
+__driver_codes = set()
+
+
+def register_driver_code(code):
+    """
+    Record the code object of a driver method wrapper, so that the executor can tell the coroutines created by driver
+    methods from other coroutines by their code, without inspecting the frame of every coroutine.
+    """
+
+    __driver_codes.add(code)
+
+
+def get_driver_of_coro(coro):
+    """
+    Get the driver of a coroutine created by a driver method.
+
+    Returns:
+        The driver if the coroutine is created by a driver method and has not finished, None otherwise.
+    """
+
+    if getattr(coro, "cr_code", None) not in __driver_codes or coro.cr_frame is None:
+        return None
+
+    # Only the frames of driver coroutines are read, the agent is an argument of the wrapper
+    agent = coro.cr_frame.f_locals.get("agent", None)
+    return getattr(agent, "drivers", {}).get(coro.__name__, None)
+
 
 """
 Executor
@@ -184,10 +269,11 @@ class Executor(MObject):
                         name is the same, the coroutines will be executed sequentially.
         """
 
+        driver = get_driver_of_coro(coro)
+
         if sche_group is None:
             sche_group = coro.__name__
 
-            driver = Executor.__get_driver(coro)
             if driver is not None:
                 sche_group = f"{driver.agent_name}.{sche_group}"
 
@@ -197,7 +283,6 @@ class Executor(MObject):
         if priority is not None:
             assert 0 <= priority <= 99, "Priority should be between 0 and 99"
 
-            driver = Executor.__get_driver(coro)
             coro_name = coro.__name__
             assert (
                 driver is not None
@@ -206,13 +291,12 @@ class Executor(MObject):
         if sche_order is not None:
             if sche_order == "parallel":
                 sche_order = "model_first"
-            driver = Executor.__get_driver(coro)
             coro_name = coro.__name__
             assert (
                 driver is not None
             ), f"{coro_name} is not a driver function, cannot set sche_order"
 
-        self.__coros[sche_group].append((coro, sche_order, priority))
+        self.__coros[sche_group].append((coro, driver, sche_order, priority))
 
     @staticmethod
     async def __sequential_execution_all(*tasks, complete_event=None):
@@ -225,9 +309,7 @@ class Executor(MObject):
         """
 
         results = []
-        for coro, sche_order, priority in tasks:
-            driver = Executor.__get_driver(coro)
-
+        for coro, driver, sche_order, priority in tasks:
             if driver is not None:
                 driver.priority = None
                 driver.sche_order = None
@@ -244,18 +326,3 @@ class Executor(MObject):
             complete_event.set()
 
         return results
-
-    @staticmethod
-    def __get_driver(coro):
-        """
-        Get the driver object of the coroutine.
-
-        Args:
-            coro: The coroutine object.
-        """
-
-        agent = coro.cr_frame.f_locals.get("agent", None)
-        driver_name = coro.__name__
-
-        if agent is not None:
-            return agent.drivers.get(driver_name, None)
@@ -161,6 +161,18 @@ critical = toffee_logger.critical
 exception = toffee_logger.exception
 
 
+summary_hooks = []
+
+
+def add_summary_hook(func):
+    """
+    Add a function to extend the summary. The function is called by summary and should return the text to be
+    appended to it, or an empty string.
+    """
+
+    summary_hooks.append(func)
+
+
 def summary():
     """Display a summary of the logs"""
 
@@ -172,5 +184,7 @@ def summary():
     # summary_str += "* Report counts by id\n"
     # for k, v in stats_handler.id_stats.items():
     #     summary_str += f"{k}:\t{v}\n"
+    for func in summary_hooks:
+        summary_str += func()
 
     toffee_logger.info(summary_str)
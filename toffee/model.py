@@ -8,9 +8,11 @@ __all__ = [
     "MonitorPort",
 ]
 
+import weakref
+
 from .asynchronous import Component
-from .asynchronous import Queue
-from .logger import warning, error
+from .asynchronous import RingQueue
+from .logger import warning
 
 
 def agent_hook(
@@ -175,29 +177,42 @@ def monitor_hook(
     return decorator
 
 
-class Port(Queue):
-    def __init__(self, name: str = "", maxsize: int = 4):
+# All ports that are alive in the order they are created, so that their statistics can be collected
+port_registry = weakref.WeakKeyDictionary()
+
+
+class Port(RingQueue):
+    kind = "port"
+
+    def __init__(self, name: str = "", maxsize: int = 4, overflow: str = "drop"):
         """
         Args:
-            name:    The name of the port.
-            maxsize: The maximum size of the port. if it is -1, the port is unbounded.
+            name:     The name of the port.
+            maxsize:  The maximum size of the port. if it is -1, the port is unbounded.
+            overflow: The policy when a value is put into a full port. If it is "block", the put waits until the
+                      model gets a value. If it is "grow", the port grows and a warning is logged once. If it is
+                      "drop", the value is dropped and counted.
         """
 
-        super().__init__()
-        assert (
-            maxsize > 0 or maxsize == -1
-        ), "maxsize must be greater than 0 or equal to -1"
+        super().__init__(maxsize, overflow, name)
 
-        self.name = name
         self.matched = False
-        self.__maxsize = maxsize
 
-    async def put(self, value):
-        if self.qsize() >= self.__maxsize and self.__maxsize != -1:
-            error(f"port attached to {self.name} is full, the value {value} is dropped")
-            return
+        port_registry[self] = None
+
+    def get_stats(self):
+        """
+        Get the statistics of the port.
+
+        Returns:
+            A dictionary of the current size, the high-water mark and the number of values dropped.
+        """
 
-        await super().put(value)
+        return {
+            "size": self.qsize(),
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+        }
 
 
 class DriverPort(Port):
@@ -212,6 +227,7 @@ class DriverPort(Port):
         agent_name: str = "",
         driver_name: str = "",
         maxsize: int = 4,
+        overflow: str = "drop",
     ):
         assert driver_path == "" or (
             agent_name == "" and driver_name == ""
@@ -221,7 +237,7 @@ class DriverPort(Port):
             agent_name != "" or driver_name == ""
         ), "agent_name must not be empty when driver_name is set"
 
-        super().__init__(maxsize=maxsize)
+        super().__init__(maxsize=maxsize, overflow=overflow)
 
         self.driver_path = driver_path
         self.agent_name = agent_name
@@ -253,9 +269,10 @@ class AgentPort(Port):
         *,
         agents: list = [],
         methods: list = [],
+        overflow: str = "drop",
     ):
 
-        super().__init__(maxsize=maxsize)
+        super().__init__(maxsize=maxsize, overflow=overflow)
 
         self.agent_name = agent_name
         self.agents = agents
@@ -281,6 +298,7 @@ class MonitorPort(Port):
         agent_name: str = "",
         monitor_name: str = "",
         maxsize: int = 4,
+        overflow: str = "drop",
     ):
         assert monitor_path == "" or (
             agent_name == "" and monitor_name == ""
@@ -290,7 +308,7 @@ class MonitorPort(Port):
             agent_name != "" or monitor_name == ""
         ), "agent_name must not be empty when monitor_name is set"
 
-        super().__init__(maxsize=maxsize)
+        super().__init__(maxsize=maxsize, overflow=overflow)
 
         self.monitor_path = monitor_path
         self.agent_name = agent_name
@@ -0,0 +1,156 @@
+__all__ = ["ClockProfiler"]
+
+import asyncio
+import csv
+
+from ._base import MObject
+
+
+class ClockProfiler(MObject):
+    """
+    Profile the clock loop of the current event loop. For each step of the clock loop, it records the wall time spent
+    stepping the DUTs, running the user coroutines until they settle, and running each callback (the priority tasks of
+    the executor, the delayer sampling and the callbacks added by add_callback), together with the number of settle
+    rounds and iterations.
+
+    The clock loop only checks whether a profiler is attached once per step, so nothing is measured while no profiler
+    is started.
+
+    >>> with ClockProfiler() as profiler:
+    ...     await ClockCycles(dut, 1000)
+    >>> print(profiler.summary())
+    >>> profiler.dump_csv("cycles.csv")
+    """
+
+    def __init__(self):
+        self.phases = {"dut_step": None, "user_coroutines": None}
+        self.records = []
+        self.__loop = None
+
+    def start(self):
+        """
+        Attach the profiler to the current event loop.
+        """
+
+        loop = asyncio.get_event_loop()
+        assert (
+            getattr(loop, "profiler", None) is None
+        ), "a profiler is already attached to the event loop"
+        loop.profiler = self
+        self.__loop = loop
+        return self
+
+    def stop(self):
+        """
+        Detach the profiler from the event loop. The records are kept.
+        """
+
+        if self.__loop is not None and self.__loop.profiler is self:
+            self.__loop.profiler = None
+        self.__loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def record(self, cycle, settle_rounds, settle_iterations, times):
+        """
+        Record one step of the clock loop. It is called by the clock loop.
+
+        Args:
+            cycle: The cycle of the first clock after the step.
+            settle_rounds: The number of times the event loop ran before all tasks settled.
+            settle_iterations: The number of times the callbacks ran before no callback asked for another settle.
+            times: A dictionary mapping each phase to the seconds spent in it.
+        """
+
+        for phase in times:
+            if phase not in self.phases:
+                self.phases[phase] = None
+        self.records.append((cycle, settle_rounds, settle_iterations, times))
+
+    def totals(self):
+        """
+        Get the total time spent in each phase.
+
+        Returns:
+            A dictionary mapping each phase to the seconds spent in it.
+        """
+
+        totals = dict.fromkeys(self.phases, 0.0)
+        for _, _, _, times in self.records:
+            for phase, seconds in times.items():
+                totals[phase] += seconds
+        return totals
+
+    def summary(self):
+        """
+        Get a summary table of the time spent in each phase.
+
+        Returns:
+            The summary table as a string.
+        """
+
+        steps = len(self.records)
+        totals = self.totals()
+        total = sum(totals.values())
+        last_cycle = self.records[-1][0] if steps else 0
+
+        lines = [
+            "Clock Profile",
+            "=============",
+            f"steps: {steps}, last cycle: {last_cycle}, total: {total:.6f}s",
+        ]
+        if steps:
+            rounds = sum(record[1] for record in self.records)
+            iterations = sum(record[2] for record in self.records)
+            lines.append(
+                f"settle rounds per step: {rounds / steps:.2f}, "
+                f"settle iterations per step: {iterations / steps:.2f}"
+            )
+
+        lines.append(f"{'phase':<28}{'total (s)':>12}{'us/step':>12}{'share':>9}")
+        for phase, seconds in totals.items():
+            per_step = seconds / steps * 1e6 if steps else 0.0
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"{phase:<28}{seconds:>12.6f}{per_step:>12.2f}{share:>8.1f}%")
+        return "\n".join(lines)
+
+    def dump_csv(self, path):
+        """
+        Write one row per step of the clock loop to a CSV file. The times are in microseconds.
+
+        Args:
+            path: The path of the CSV file.
+        """
+
+        phases = list(self.phases)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["cycle", "settle_rounds", "settle_iterations"] + phases)
+            for cycle, rounds, iterations, times in self.records:
+                writer.writerow(
+                    [cycle, rounds, iterations]
+                    + [f"{times.get(phase, 0.0) * 1e6:.3f}" for phase in phases]
+                )
+
+    def dump_folded(self, path):
+        """
+        Write the total time of each phase as folded stacks, in microseconds. The file can be read by flamegraph.pl
+        or speedscope.
+
+        Args:
+            path: The path of the output file.
+        """
+
+        with open(path, "w") as f:
+            for phase, seconds in self.totals().items():
+                if phase == "dut_step":
+                    stack = "clock_loop;dut_step"
+                elif phase == "user_coroutines":
+                    stack = "clock_loop;settle;user_coroutines"
+                else:
+                    stack = f"clock_loop;settle;callbacks;{phase}"
+                f.write(f"{stack} {round(seconds * 1e6)}\n")
@@ -0,0 +1,272 @@
+__all__ = ["TraceRecorder", "TracePlayer"]
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+from ._base import MObject
+from .asynchronous import add_callback
+from .asynchronous import remove_callback
+
+# File layout:
+#   magic (8 bytes) | header length (8 bytes, little-endian) | JSON header, padded to 8 bytes | rows
+# Every row holds the values of all columns as little-endian 64-bit words. A value that is wider than 64 bits takes
+# several words, least significant word first.
+TRACE_MAGIC = b"TFTRACE1"
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+
+def split_bundle_signals(bundle):
+    """
+    Split the connected signals of a bundle into inputs and outputs.
+
+    Args:
+        bundle: The bundle to split.
+
+    Returns:
+        A tuple of the list of input signal names and the list of output signal names.
+    """
+
+    inputs, outputs = [], []
+    for name, signal in bundle.all_signals():
+        is_out_io = getattr(signal, "IsOutIO", None)
+        if is_out_io is None:
+            # Unconnected signals are not recorded
+            continue
+        (outputs if is_out_io() else inputs).append(name)
+    return inputs, outputs
+
+
+class TraceRecorder(MObject):
+    """
+    Record the values of the signals in a bundle on each cycle into a trace file. The file is a compact binary file
+    of fixed size rows, which can be memory-mapped and played by TracePlayer.
+
+    >>> with TraceRecorder(bundle, "adder.trace") as recorder:
+    ...     await recorder.run(1000)
+    """
+
+    def __init__(self, bundle, path, inputs=None, outputs=None):
+        """
+        Args:
+            bundle: The bundle to record.
+            path: The path of the trace file.
+            inputs: The names of the input signals, as yielded by all_signals. If it is None, all connected signals
+                    that are not outputs of the DUT are recorded as inputs.
+            outputs: The names of the output signals. If it is None, all connected outputs of the DUT are recorded.
+        """
+
+        default_inputs, default_outputs = split_bundle_signals(bundle)
+        self.bundle = bundle
+        self.inputs = default_inputs if inputs is None else list(inputs)
+        self.outputs = default_outputs if outputs is None else list(outputs)
+        self.cycles = 0
+
+        self.__reader = bundle.compile_reader(self.inputs + self.outputs)
+        self.__input_reader = bundle.compile_reader(self.inputs)
+        self.__inputs = None
+        self.__words = [TraceRecorder.__signal_words(s) for s in self.__reader.signals]
+        self.__row = struct.Struct(f"<{sum(self.__words)}Q")
+
+        header = json.dumps(
+            {"inputs": self.inputs, "outputs": self.outputs, "words": self.__words}
+        ).encode()
+        header += b" " * (-len(header) % 8)
+
+        self.__file = open(path, "wb")
+        self.__file.write(TRACE_MAGIC + struct.pack("<Q", len(header)) + header)
+
+    @staticmethod
+    def __signal_words(signal):
+        width = signal.W() if hasattr(signal, "W") else WORD_BITS
+        return max(1, -(-width // WORD_BITS))
+
+    def sample(self):
+        """
+        Append the current values of the signals to the trace as one row. It should be called after the DUT is
+        stepped with the inputs of the row and before the inputs are changed, so the row holds the outputs computed
+        from its inputs. Unconnected values (None) are recorded as 0.
+        """
+
+        self.__write_row(self.__reader())
+
+    def __write_row(self, values):
+        words = []
+        for value, nwords in zip(values, self.__words):
+            value = value or 0
+            if nwords == 1:
+                words.append(value)
+            else:
+                for _ in range(nwords):
+                    words.append(value & WORD_MASK)
+                    value >>= WORD_BITS
+        self.__file.write(self.__row.pack(*words))
+        self.cycles += 1
+
+    async def __capture_inputs(self):
+        self.__inputs = self.__input_reader()
+        return False
+
+    async def run(self, ncycles=None):
+        """
+        Record one row on each clock cycle of the bundle. The inputs are captured by a callback of the clock loop,
+        after all tasks have settled and right before the DUT is stepped, and the outputs are read after the step. A
+        row therefore holds the inputs the DUT is stepped with and the outputs computed from them, no matter in which
+        order the recorder and the tasks driving the inputs are woken up.
+
+        Args:
+            ncycles: The number of cycles to record. If it is None, record until the task is cancelled.
+        """
+
+        handle = add_callback(self.__capture_inputs)
+        try:
+            while ncycles is None or self.cycles < ncycles:
+                await self.bundle.step()
+                values = self.__reader()
+                self.__write_row(self.__inputs + values[len(self.inputs) :])
+        finally:
+            remove_callback(handle)
+
+    def close(self):
+        """
+        Flush and close the trace file.
+        """
+
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TracePlayer(MObject):
+    """
+    Read a trace file recorded by TraceRecorder. The file is memory-mapped, and a column of 64-bit values is a view
+    of the mapped file, so no value is copied until it is used.
+
+    >>> player = TracePlayer("adder.trace")
+    >>> outputs = player.play(bundle)
+    >>> assert list(outputs["sum"]) == list(player.column("sum"))
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: The path of the trace file.
+        """
+
+        with open(path, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        assert self.__mmap[:8] == TRACE_MAGIC, f"{path} is not a trace file"
+        (header_len,) = struct.unpack_from("<Q", self.__mmap, 8)
+        header = json.loads(bytes(self.__mmap[16 : 16 + header_len]))
+
+        self.inputs = header["inputs"]
+        self.outputs = header["outputs"]
+        self.__words = header["words"]
+        self.__row_words = sum(self.__words)
+
+        self.__offsets = {}
+        offset = 0
+        for name, nwords in zip(self.inputs + self.outputs, self.__words):
+            self.__offsets[name] = (offset, nwords)
+            offset += nwords
+
+        self.__view = memoryview(self.__mmap)[16 + header_len :]
+        if sys.byteorder == "little":
+            self.__data = self.__view.cast("Q")
+        else:
+            self.__data = array.array("Q", bytes(self.__view))
+            self.__data.byteswap()
+
+        self.cycles = len(self.__data) // self.__row_words if self.__row_words else 0
+
+    def __len__(self):
+        return self.cycles
+
+    def column(self, name):
+        """
+        Get the recorded values of a signal.
+
+        Args:
+            name: The name of the signal.
+
+        Returns:
+            A sequence of the values on each cycle.
+        """
+
+        assert name in self.__offsets, f'signal "{name}" is not in the trace'
+        offset, nwords = self.__offsets[name]
+        row_words = self.__row_words
+
+        if nwords == 1:
+            return self.__data[offset::row_words]
+
+        words = [self.__data[offset + i :: row_words] for i in range(nwords)]
+        return [
+            sum(word << (WORD_BITS * i) for i, word in enumerate(row_words_values))
+            for row_words_values in zip(*words)
+        ]
+
+    def play(self, bundle, outputs=None):
+        """
+        Drive a bundle with the recorded inputs through Bundle.process_columns, one row per cycle. Like
+        TraceRecorder.sample, the outputs of a row are sampled after the DUT is stepped with its inputs, and the inputs
+        are sampled as written, so a replay of a trace reproduces the recorded rows.
+
+        Args:
+            bundle: The bundle to drive. It should be bound to a DUT.
+            outputs: The names of the signals to sample. If it is None, the recorded outputs are sampled.
+
+        Returns:
+            A dictionary mapping each output signal name to the column of its sampled values.
+        """
+
+        outputs = self.outputs if outputs is None else outputs
+        columns = bundle.process_columns(
+            {name: self.column(name) for name in self.inputs},
+            outputs,
+            ncycles=self.cycles,
+        )
+        dut_outputs = [name for name in columns if name not in self.inputs]
+        if not self.cycles or not dut_outputs:
+            return columns
+
+        # process_columns samples the signals on the rising edge, right after writing the inputs of the row and before
+        # the DUT is stepped with them. The outputs of a row are therefore the samples of the next row, and those of
+        # the last row are read after the last step.
+        reader = bundle.compile_reader(dut_outputs)
+        for key, value in zip(reader.keys, reader()):
+            column = columns[key][1:]
+            try:
+                column.append(value)
+            except (OverflowError, TypeError):
+                column = list(column) + [value]
+            columns[key] = column
+        return columns
+
+    def close(self):
+        """
+        Release the memory-mapped file. If columns taken from the player are still referenced, the file is unmapped
+        once they are released.
+        """
+
+        if isinstance(self.__data, memoryview):
+            self.__data.release()
+        self.__view.release()
+        try:
+            self.__mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -8,6 +8,8 @@ __all__ = [
     "FallingEdge",
 ]
 
+from ._clock import wait_condition
+from ._clock import wait_cycles
 from .bundle import Bundle
 
 
@@ -22,8 +24,7 @@ async def ClockCycles(item, ncycles=1):
 
     # item is xpin
     if hasattr(item, "event"):
-        for _ in range(ncycles):
-            await item.event.wait()
+        await wait_cycles(item.event, ncycles)
 
     # item is Bundle
     elif isinstance(item, Bundle):
@@ -31,8 +32,7 @@ async def ClockCycles(item, ncycles=1):
 
     # item is dut
     else:
-        for _ in range(ncycles):
-            await item.wait()
+        await wait_cycles(item, ncycles)
 
 
 async def Value(pin, value: int, delay=1):
@@ -45,10 +45,9 @@ async def Value(pin, value: int, delay=1):
         delay: The minimum number of clock cycles to pass before checking.
     """
 
-    for _ in range(delay):
-        await pin.event.wait()
+    await wait_cycles(pin.event, delay)
     while pin.value != value:
-        await pin.event.wait()
+        await wait_condition(pin.event, (pin,), lambda pin_value: pin_value == value)
 
 
 async def AllValid(*pins, delay=1):
@@ -60,11 +59,9 @@ async def AllValid(*pins, delay=1):
         delay: The minimum number of clock cycles to pass before checking.
     """
 
-    for _ in range(delay):
-        await pins[0].event.wait()
-
+    await wait_cycles(pins[0].event, delay)
     while not all(pin.value for pin in pins):
-        await pins[0].event.wait()
+        await wait_condition(pins[0].event, pins, lambda *values: all(values))
 
 
 async def Condition(item, func, delay=1):
@@ -77,6 +74,7 @@ async def Condition(item, func, delay=1):
         delay: The minimum number of clock cycles to pass before checking.
     """
 
+    # func may read any Python state, so it is checked by the waiting task itself on each cycle
     await ClockCycles(item, delay)
     while not func(item):
         await ClockCycles(item)
@@ -91,8 +89,25 @@ async def Change(pin):
     """
 
     old_value = pin.value
-    while pin.value == old_value:
-        await pin.event.wait()
+    await wait_condition(pin.event, (pin,), lambda pin_value: pin_value != old_value)
+
+
+def __edge_condition(pin, is_edge):
+    """
+    Create a condition that compares the pin value with its value in the previous cycle.
+
+    Args:
+        pin: The pin to be checked.
+        is_edge: A function that accepts the previous value and the current value and returns a boolean.
+    """
+
+    last_value = [pin.value]
+
+    def condition(pin_value):
+        old_value, last_value[0] = last_value[0], pin_value
+        return is_edge(old_value, pin_value)
+
+    return condition
 
 
 async def RisingEdge(pin):
@@ -104,10 +119,8 @@ async def RisingEdge(pin):
         pin: The pin to be checked.
     """
 
-    old_value = pin.value
-    while old_value != 0 or pin.value == old_value:
-        old_value = pin.value
-        await pin.event.wait()
+    condition = __edge_condition(pin, lambda old, new: old == 0 and new != 0)
+    await wait_condition(pin.event, (pin,), condition)
 
 
 async def FallingEdge(pin):
@@ -119,7 +132,5 @@ async def FallingEdge(pin):
         pin: The pin to be checked.
     """
 
-    old_value = pin.value
-    while pin.value != 0 or pin.value == old_value:
-        old_value = pin.value
-        await pin.event.wait()
+    condition = __edge_condition(pin, lambda old, new: old != 0 and new == 0)
+    await wait_condition(pin.event, (pin,), condition)